@@ -1,6 +1,6 @@
 from aiogram import Router, F
 from aiogram.types import CallbackQuery
-from data.database import AsyncSessionLocal
+from data.database import AsyncSessionLocal, ReadSessionLocal
 from data.repositories.signal_repo import SignalRepository
 from data.repositories.bankroll_repo import BankrollRepository
 from data.repositories.pattern_stat_repo import PatternStatRepository
@@ -21,7 +21,7 @@ router = Router()
 async def signal_filter_callback(callback: CallbackQuery):
     filter_type = callback.data.split(":")[1]
 
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         signal_repo = SignalRepository(session)
         header, signals = await build_signals_response(signal_repo, filter_type)
 
@@ -41,7 +41,7 @@ async def signal_filter_callback(callback: CallbackQuery):
 async def signal_detail_callback(callback: CallbackQuery):
     signal_id = int(callback.data.split(":")[1])
 
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         signal_repo = SignalRepository(session)
         signals = await signal_repo.get_latest(limit=20)
         signal = next((s for s in signals if s.id == signal_id), None)
@@ -105,7 +105,7 @@ async def signal_placed_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "bankroll_history")
 async def bankroll_history_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         bankroll_repo = BankrollRepository(session)
         history = await bankroll_repo.get_history(limit=10)
 
@@ -130,7 +130,7 @@ async def bankroll_reset_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "perf_patterns")
 async def perf_patterns_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         pattern_repo = PatternStatRepository(session)
         patterns = await pattern_repo.get_all()
 
@@ -152,7 +152,7 @@ async def perf_patterns_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "perf_recent")
 async def perf_recent_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         signal_repo = SignalRepository(session)
         signals = await signal_repo.get_latest(limit=10)
 
@@ -172,7 +172,7 @@ async def perf_recent_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "browse:upcoming")
 async def browse_upcoming_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         match_repo = MatchRepository(session)
         matches = await match_repo.get_upcoming()
 
@@ -197,7 +197,7 @@ async def browse_upcoming_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "browse:results")
 async def browse_results_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         match_repo = MatchRepository(session)
         matches = await match_repo.get_recent_finished(limit=15)
 
@@ -220,7 +220,7 @@ async def browse_results_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "browse:standings")
 async def browse_standings_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         standing_repo = StandingRepository(session)
         standings = await standing_repo.get_latest()
 
@@ -245,7 +245,7 @@ async def browse_standings_callback(callback: CallbackQuery):
 
 @router.callback_query(F.data == "browse:odds")
 async def browse_odds_callback(callback: CallbackQuery):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         match_repo = MatchRepository(session)
         odds_repo = OddsRepository(session)
         upcoming = await match_repo.get_upcoming()
@@ -31,12 +31,12 @@ async def cmd_risk_settings(message: Message):
 
 @router.message(F.text == "Admin: Status")
 async def cmd_status(message: Message):
-    from data.database import AsyncSessionLocal
+    from data.database import ReadSessionLocal
     from data.repositories.match_repo import MatchRepository
     from data.repositories.signal_repo import SignalRepository
     from data.repositories.bankroll_repo import BankrollRepository
 
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         match_repo = MatchRepository(session)
         signal_repo = SignalRepository(session)
         bankroll_repo = BankrollRepository(session)
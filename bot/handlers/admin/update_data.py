@@ -12,6 +12,8 @@ async def cmd_update_data(message: Message):
     try:
         runner = DailyRunner()
         stats = await runner.run_daily_cycle()
+        failed = stats.get("failed_fetches")
+        failed_line = f"\nFailed fetches: {', '.join(failed)}" if failed else ""
 
         await message.answer(
             f"*Data Update Complete*\n\n"
@@ -19,7 +21,8 @@ async def cmd_update_data(message: Message):
             f"Matches synced: {stats['matches']}\n"
             f"Standings updated: {stats['standings']}\n"
             f"Odds snapshots: {stats['odds']}\n"
-            f"New signals: {stats['signals']}",
+            f"New signals: {stats['signals']}"
+            f"{failed_line}",
             parse_mode="Markdown",
         )
     except Exception as e:
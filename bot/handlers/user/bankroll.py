@@ -1,6 +1,6 @@
 from aiogram import Router, F
 from aiogram.types import Message
-from data.database import AsyncSessionLocal
+from data.database import ReadSessionLocal
 from data.repositories.bankroll_repo import BankrollRepository
 from bot.keyboards.user_menu import get_bankroll_keyboard
 
@@ -9,7 +9,7 @@ router = Router()
 
 @router.message(F.text == "Bankroll")
 async def cmd_bankroll(message: Message):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         bankroll_repo = BankrollRepository(session)
         balance = await bankroll_repo.get_current_balance()
         history = await bankroll_repo.get_history(limit=5)
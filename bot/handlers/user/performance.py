@@ -1,6 +1,6 @@
 from aiogram import Router, F
 from aiogram.types import Message
-from data.database import AsyncSessionLocal
+from data.database import ReadSessionLocal
 from data.repositories.signal_repo import SignalRepository
 from data.repositories.pattern_stat_repo import PatternStatRepository
 from bot.keyboards.user_menu import get_performance_keyboard
@@ -10,7 +10,7 @@ router = Router()
 
 @router.message(F.text == "Performance")
 async def cmd_performance(message: Message):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         signal_repo = SignalRepository(session)
         stats = await signal_repo.get_performance_stats()
 
@@ -1,6 +1,6 @@
 from aiogram import Router, F
 from aiogram.types import Message
-from data.database import AsyncSessionLocal
+from data.database import ReadSessionLocal
 from data.repositories.signal_repo import SignalRepository
 from bot.keyboards.user_menu import get_signal_filter_keyboard, get_signal_details_keyboard
 from bot.signal_view_helpers import build_signals_response, group_and_format
@@ -10,7 +10,7 @@ router = Router()
 
 @router.message(F.text == "Signals")
 async def cmd_signals(message: Message):
-    async with AsyncSessionLocal() as session:
+    async with ReadSessionLocal() as session:
         signal_repo = SignalRepository(session)
         header, signals = await build_signals_response(signal_repo, "matchday")
 
@@ -13,6 +13,11 @@ class Settings(BaseSettings):
     ODDS_API_KEY: SecretStr = SecretStr("")
 
     SQLITE_DB_PATH: str = SQLITE_URL
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB, i.e. 64 MiB per connection
+    SQLITE_MMAP_SIZE: int = 268435456
 
     ADMIN_IDS: str = ""
 
@@ -21,6 +26,39 @@ class Settings(BaseSettings):
     MAX_STAKE_PERCENT: float = 0.05
     DEFAULT_BANKROLL: float = 1000.0
 
+    PMF_CACHE_STEP: float = 0.005
+    PMF_CACHE_SIZE: int = 2048
+    GRID_TAIL_TOLERANCE: float = 1e-6
+    CLOSED_FORM_FAST_MODE: bool = False
+    SCORE_TABLE_PATH: str = ""
+    DEVIG_METHOD: str = "proportional"
+    ANALYSIS_WORKERS: int = 0
+    ANALYSIS_CHUNK_SIZE: int = 16
+    PIPELINE_QUEUE_SIZE: int = 2
+
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP2_ENABLED: bool = True
+    HTTP_CACHE_DIR: str = ".http_cache"
+    # Seconds a cached response is served without asking the API; longest prefix wins.
+    HTTP_CACHE_TTLS: dict[str, int] = {
+        "competitions/PL/matches": 600,
+        "competitions/PL/standings": 1800,
+        "teams/": 21600,
+    }
+    HTTP_CACHE_DEFAULT_TTL: int = 0
+    FOOTBALL_DATA_TIMEOUT: float = 30.0
+    FOOTBALL_DATA_RATE_LIMIT: int = 10
+    FOOTBALL_DATA_MAX_RETRIES: int = 3
+    ODDS_API_TIMEOUT: float = 30.0
+
+    MATCHES_FETCH_TIMEOUT: float = 45.0
+    STANDINGS_FETCH_TIMEOUT: float = 30.0
+    ODDS_FETCH_TIMEOUT: float = 30.0
+
     DAILY_RUN_HOUR: int = 5
     DAILY_RUN_MINUTE: int = 0
 
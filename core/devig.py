@@ -0,0 +1,72 @@
+import numpy as np
+
+DEVIG_METHODS = ("proportional", "power", "shin")
+
+
+def implied_probs(odds) -> np.ndarray:
+    odds = np.atleast_2d(np.asarray(odds, dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(odds > 1, 1.0 / odds, np.nan)
+
+
+def overround(odds) -> np.ndarray:
+    return implied_probs(odds).sum(axis=1) - 1.0
+
+
+def proportional(odds) -> np.ndarray:
+    raw = implied_probs(odds)
+    return raw / raw.sum(axis=1, keepdims=True)
+
+
+def power(odds, tol: float = 1e-10, max_iter: int = 50) -> np.ndarray:
+    # Solve sum(p_i ** k) = 1 per row with Newton's method; f(k) is convex and
+    # decreasing, so starting from k = 1 converges monotonically.
+    raw = implied_probs(odds)
+    log_raw = np.log(raw)
+    k = np.ones((raw.shape[0], 1))
+    for _ in range(max_iter):
+        powered = raw ** k
+        f = powered.sum(axis=1, keepdims=True) - 1.0
+        if not np.any(np.abs(f) > tol):
+            break
+        k = k - f / (powered * log_raw).sum(axis=1, keepdims=True)
+    return raw ** k
+
+
+def _shin_probs(raw: np.ndarray, total: np.ndarray, z: np.ndarray) -> np.ndarray:
+    return (np.sqrt(z ** 2 + 4.0 * (1.0 - z) * raw ** 2 / total) - z) / (2.0 * (1.0 - z))
+
+
+def shin(odds, tol: float = 1e-10, max_iter: int = 60) -> np.ndarray:
+    # Shin (1993): solve for the insider share z in [0, 1) so the outcome
+    # probabilities sum to one. Bisection works for two-way and three-way books
+    # alike (the usual fixed-point update divides by n - 2). Books without a
+    # margin have no insider share and fall back to proportional.
+    raw = implied_probs(odds)
+    total = raw.sum(axis=1, keepdims=True)
+    lo = np.zeros_like(total)
+    hi = np.ones_like(total)
+    for _ in range(max_iter):
+        z = (lo + hi) / 2.0
+        over = _shin_probs(raw, total, z).sum(axis=1, keepdims=True) > 1.0
+        lo = np.where(over, z, lo)
+        hi = np.where(over, hi, z)
+        if np.nanmax(hi - lo, initial=0.0) < tol:
+            break
+    fair = _shin_probs(raw, total, (lo + hi) / 2.0)
+    return np.where(total > 1.0, fair, raw / total)
+
+
+def devig(odds, method: str = "proportional") -> np.ndarray:
+    # odds: (N, K) decimal odds for N complete books of K outcomes (1X2 or two-way
+    # totals). Rows with a missing or invalid price come back as NaN.
+    if method == "proportional":
+        fair = proportional(odds)
+    elif method == "power":
+        fair = power(odds)
+    elif method == "shin":
+        fair = shin(odds)
+    else:
+        raise ValueError(f"Unknown devig method: {method}")
+    fair[~np.isfinite(fair).all(axis=1)] = np.nan
+    return fair
@@ -0,0 +1,209 @@
+import numpy as np
+
+from utils.formatters import MARKET_LABELS  # noqa: F401
+
+# One row per bet type. Everything that used to be repeated across the value detector,
+# settlement and consistency scoring is read from here. Display labels stay with the
+# other formatting tables in utils.formatters and are re-exported as MARKET_LABELS.
+#   prob        key in the probability report
+#   complement  the market is 1 - prob (unders are priced from the matching over)
+#   odds        bookmaker odds field; markets without one are model-only
+#   book        outcomes priced together by the bookmaker (margin is removed per book)
+#   typical     reference odds for model-only markets (None = never evaluated)
+#   consistency feature key used as the historical consistency score
+#   inverse     consistency is 1 - feature
+#   half_time   settlement needs the half-time score
+#   settle      (home, away, ht_home, ht_away) -> won; works on scalars and numpy arrays
+MARKET_SPECS = (
+    {"bet_type": "HOME_WIN", "market": "1x2",
+     "prob": "home", "odds": "home_odds", "book": "1x2", "consistency": "home_form_avg",
+     "settle": lambda h, a, hh, ha: h > a},
+    {"bet_type": "DRAW", "market": "1x2",
+     "prob": "draw", "odds": "draw_odds", "book": "1x2",
+     "settle": lambda h, a, hh, ha: h == a},
+    {"bet_type": "AWAY_WIN", "market": "1x2",
+     "prob": "away", "odds": "away_odds", "book": "1x2", "consistency": "away_form_avg",
+     "settle": lambda h, a, hh, ha: a > h},
+    {"bet_type": "OVER_2.5", "market": "totals",
+     "prob": "over_25", "odds": "over_25_odds", "book": "totals_25", "consistency": "over_25_home_rate",
+     "settle": lambda h, a, hh, ha: h + a > 2},
+    {"bet_type": "UNDER_2.5", "market": "totals",
+     "prob": "over_25", "complement": True, "odds": "under_25_odds", "book": "totals_25",
+     "consistency": "over_25_home_rate", "inverse": True,
+     "settle": lambda h, a, hh, ha: h + a < 3},
+    {"bet_type": "OVER_1.5", "market": "totals",
+     "prob": "over_15", "odds": "over_15_odds", "book": "totals_15", "consistency": "over_15_home_rate",
+     "settle": lambda h, a, hh, ha: h + a > 1},
+    {"bet_type": "UNDER_1.5", "market": "totals",
+     "prob": "over_15", "complement": True, "odds": "under_15_odds", "book": "totals_15",
+     "consistency": "over_15_home_rate", "inverse": True,
+     "settle": lambda h, a, hh, ha: h + a < 2},
+    {"bet_type": "OVER_3.5", "market": "totals",
+     "prob": "over_35", "odds": "over_35_odds", "book": "totals_35", "consistency": "over_35_home_rate",
+     "settle": lambda h, a, hh, ha: h + a > 3},
+    {"bet_type": "UNDER_3.5", "market": "totals",
+     "prob": "over_35", "complement": True, "odds": "under_35_odds", "book": "totals_35",
+     "consistency": "over_35_home_rate", "inverse": True,
+     "settle": lambda h, a, hh, ha: h + a < 4},
+    {"bet_type": "OVER_0.5", "market": "totals",
+     "prob": "over_05",
+     "settle": lambda h, a, hh, ha: h + a > 0},
+    {"bet_type": "BTTS_YES", "market": "btts",
+     "prob": "btts_yes", "typical": 1.80, "consistency": "btts_home_rate",
+     "settle": lambda h, a, hh, ha: (h > 0) & (a > 0)},
+    {"bet_type": "BTTS_NO", "market": "btts",
+     "prob": "btts_no", "typical": 1.95, "consistency": "btts_home_rate", "inverse": True,
+     "settle": lambda h, a, hh, ha: (h == 0) | (a == 0)},
+    {"bet_type": "CLEAN_SHEET_HOME", "market": "clean_sheet",
+     "prob": "clean_sheet_home", "typical": 2.50, "consistency": "clean_sheet_home_rate",
+     "settle": lambda h, a, hh, ha: a == 0},
+    {"bet_type": "CLEAN_SHEET_AWAY", "market": "clean_sheet",
+     "prob": "clean_sheet_away", "typical": 3.00, "consistency": "clean_sheet_away_rate",
+     "settle": lambda h, a, hh, ha: h == 0},
+    {"bet_type": "ODD_GOALS", "market": "odd_even",
+     "prob": "odd_goals", "typical": 1.90, "consistency": "odd_goals_rate",
+     "settle": lambda h, a, hh, ha: (h + a) % 2 == 1},
+    {"bet_type": "EVEN_GOALS", "market": "odd_even",
+     "prob": "even_goals", "typical": 1.90, "consistency": "odd_goals_rate", "inverse": True,
+     "settle": lambda h, a, hh, ha: (h + a) % 2 == 0},
+    {"bet_type": "HT_HOME", "market": "half_time",
+     "prob": "ht_home", "typical": 2.80, "half_time": True,
+     "settle": lambda h, a, hh, ha: hh > ha},
+    {"bet_type": "HT_DRAW", "market": "half_time",
+     "prob": "ht_draw", "typical": 2.00, "half_time": True,
+     "settle": lambda h, a, hh, ha: hh == ha},
+    {"bet_type": "HT_AWAY", "market": "half_time",
+     "prob": "ht_away", "typical": 4.50, "half_time": True,
+     "settle": lambda h, a, hh, ha: ha > hh},
+    {"bet_type": "HT_OVER_0.5", "market": "half_time",
+     "prob": "ht_over_05", "typical": 1.40, "half_time": True,
+     "settle": lambda h, a, hh, ha: hh + ha > 0},
+    {"bet_type": "HT_OVER_1.5", "market": "half_time",
+     "prob": "ht_over_15", "half_time": True,
+     "settle": lambda h, a, hh, ha: hh + ha > 1},
+    {"bet_type": "LATE_GOAL", "market": "late_goal",
+     "prob": "late_goal", "typical": 2.20, "consistency": "late_goal_home_rate", "half_time": True,
+     "settle": lambda h, a, hh, ha: (h + a) - (hh + ha) >= 2},
+)
+
+BET_TYPES = tuple(spec["bet_type"] for spec in MARKET_SPECS)
+MARKET_IDS = {bet_type: i for i, bet_type in enumerate(BET_TYPES)}
+MARKET_COUNT = len(BET_TYPES)
+
+MARKET_KEYS = {spec["bet_type"]: spec["market"] for spec in MARKET_SPECS}
+BOOKMAKER_MARKET_KEYS = frozenset(spec["market"] for spec in MARKET_SPECS if spec.get("odds"))
+
+PROB_KEYS = tuple(spec["prob"] for spec in MARKET_SPECS)
+ODDS_KEYS = tuple(spec.get("odds") for spec in MARKET_SPECS)
+COMPLEMENT = np.array([spec.get("complement", False) for spec in MARKET_SPECS])
+TYPICAL_ODDS = np.array([spec.get("typical") or np.nan for spec in MARKET_SPECS])
+BOOKMAKER_IDS = np.array([i for i, key in enumerate(ODDS_KEYS) if key], dtype=np.int64)
+MODEL_ONLY_IDS = np.array(
+    [i for i, spec in enumerate(MARKET_SPECS) if not spec.get("odds") and spec.get("typical")],
+    dtype=np.int64,
+)
+BOOKS = tuple(
+    np.array([i for i, spec in enumerate(MARKET_SPECS) if spec.get("book") == book], dtype=np.int64)
+    for book in dict.fromkeys(spec["book"] for spec in MARKET_SPECS if spec.get("book"))
+)
+HALF_TIME = np.array([spec.get("half_time", False) for spec in MARKET_SPECS])
+
+# Flattened rows for the scalar detector loop, in evaluation order.
+BOOKMAKER_MARKETS = tuple(
+    (int(i), BET_TYPES[i], MARKET_KEYS[BET_TYPES[i]], PROB_KEYS[i], bool(COMPLEMENT[i]), ODDS_KEYS[i])
+    for i in BOOKMAKER_IDS
+)
+MODEL_ONLY_MARKETS = tuple(
+    (BET_TYPES[i], MARKET_KEYS[BET_TYPES[i]], PROB_KEYS[i], float(TYPICAL_ODDS[i]))
+    for i in MODEL_ONLY_IDS
+)
+
+_CONSISTENCY = {
+    spec["bet_type"]: (spec["consistency"], spec.get("inverse", False))
+    for spec in MARKET_SPECS if spec.get("consistency")
+}
+_SETTLE = {spec["bet_type"]: (spec["settle"], spec.get("half_time", False)) for spec in MARKET_SPECS}
+
+
+def market_id(bet_type: str) -> int:
+    return MARKET_IDS[bet_type]
+
+
+def consistency(bet_type: str, features: dict | None, default: float = 0.5) -> float:
+    if not features:
+        return default
+    feat_key, inverse = _CONSISTENCY.get(bet_type, (None, False))
+    if feat_key and feat_key in features:
+        value = features[feat_key]
+        return 1.0 - value if inverse else value
+    return default
+
+
+def settle(bet_type: str, home: int, away: int, ht_home: int | None = None, ht_away: int | None = None):
+    rule = _SETTLE.get(bet_type)
+    if rule is None:
+        return None
+    fn, needs_ht = rule
+    if needs_ht and (ht_home is None or ht_away is None):
+        return None
+    return bool(fn(home, away, ht_home, ht_away))
+
+
+def settle_all(home: int, away: int, ht_home: int | None = None, ht_away: int | None = None) -> dict:
+    has_ht = ht_home is not None and ht_away is not None
+    return {
+        bet_type: bool(fn(home, away, ht_home, ht_away))
+        for bet_type, (fn, needs_ht) in _SETTLE.items()
+        if has_ht or not needs_ht
+    }
+
+
+def settle_many(bet_types, home, away, ht_home, ht_away) -> list:
+    # Vectorised settle(): one numpy evaluation per bet type. Rows are True/False,
+    # or None where the market is unknown or needs a missing half-time score.
+    home = np.asarray(home, dtype=np.float64)
+    away = np.asarray(away, dtype=np.float64)
+    ht_home = np.array([np.nan if v is None else v for v in ht_home], dtype=np.float64)
+    ht_away = np.array([np.nan if v is None else v for v in ht_away], dtype=np.float64)
+    has_ht = ~(np.isnan(ht_home) | np.isnan(ht_away))
+
+    bet_types = np.asarray(bet_types, dtype=object)
+    results = [None] * len(bet_types)
+    for bet_type in set(bet_types.tolist()):
+        rule = _SETTLE.get(bet_type)
+        if rule is None:
+            continue
+        fn, needs_ht = rule
+        rows = np.flatnonzero(bet_types == bet_type)
+        if needs_ht:
+            rows = rows[has_ht[rows]]
+        won = fn(home[rows], away[rows], ht_home[rows], ht_away[rows])
+        for row, value in zip(rows.tolist(), won.tolist()):
+            results[row] = bool(value)
+    return results
+
+
+def prob_vector(probs: dict) -> np.ndarray:
+    # (M,) model probabilities in registry order; NaN where the report lacks the key.
+    return prob_matrix([probs])[0]
+
+
+def odds_vector(odds: dict | None) -> np.ndarray:
+    # (M,) bookmaker decimal odds in registry order; NaN where missing or unusable.
+    return odds_matrix([odds])[0]
+
+
+def prob_matrix(probs_list: list[dict]) -> np.ndarray:
+    raw = np.array(
+        [[probs.get(key, np.nan) for key in PROB_KEYS] for probs in probs_list], dtype=np.float64
+    ).reshape(len(probs_list), MARKET_COUNT)
+    return np.where(COMPLEMENT, 1.0 - raw, raw)
+
+
+def odds_matrix(odds_list: list[dict | None]) -> np.ndarray:
+    values = np.array(
+        [[((odds or {}).get(key) or np.nan) if key else np.nan for key in ODDS_KEYS] for odds in odds_list],
+        dtype=np.float64,
+    ).reshape(len(odds_list), MARKET_COUNT)
+    values[values <= 1] = np.nan
+    return values
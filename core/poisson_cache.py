@@ -0,0 +1,76 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _log_factorials(max_goals: int) -> np.ndarray:
+    return np.array([math.lgamma(k + 1) for k in range(max_goals + 1)])
+
+
+def poisson_pmf_matrix(lams, max_goals: int) -> np.ndarray:
+    lams = np.asarray(lams, dtype=np.float64)
+    k = np.arange(max_goals + 1)
+    log_lam = np.log(np.maximum(lams, 1e-300))[:, None]
+    pmf = np.exp(k * log_lam - lams[:, None] - _log_factorials(max_goals))
+    pmf[lams <= 0] = (k == 0)
+    return pmf
+
+
+class PoissonPMFCache:
+    # Direct-mapped table over the quantized xG lattice: row i holds the PMF for
+    # xG = i * step. Rows are filled on first use; xG beyond the table is computed
+    # on the fly and counted as a miss.
+    def __init__(self, step: float = 0.005, max_entries: int = 2048, max_goals: int = 7):
+        self.step = step
+        self.max_entries = max_entries
+        self.max_goals = max_goals
+        self.hits = 0
+        self.misses = 0
+        self._table = np.zeros((max(max_entries, 0), max_goals + 1))
+        self._filled = np.zeros(max(max_entries, 0), dtype=bool)
+
+    def get_many(self, lams) -> np.ndarray:
+        lams = np.asarray(lams, dtype=np.float64)
+        if not self.step or self.max_entries <= 0:
+            self.misses += len(lams)
+            return poisson_pmf_matrix(lams, self.max_goals)
+
+        idx = np.rint(lams / self.step).astype(np.int64)
+        in_table = (idx >= 0) & (idx < self.max_entries)
+        slots = np.where(in_table, idx, 0)
+        cached = in_table & self._filled[slots]
+        n_cached = int(cached.sum())
+        self.hits += n_cached
+        self.misses += len(lams) - n_cached
+
+        if n_cached < len(lams):
+            new_slots = np.unique(slots[in_table & ~cached])
+            if len(new_slots):
+                self._table[new_slots] = poisson_pmf_matrix(new_slots * self.step, self.max_goals)
+                self._filled[new_slots] = True
+
+        pmf = self._table[slots]
+        if not in_table.all():
+            outside = ~in_table
+            pmf[outside] = poisson_pmf_matrix(idx[outside] * self.step, self.max_goals)
+        return pmf
+
+    def get(self, lam: float) -> np.ndarray:
+        return self.get_many([lam])[0]
+
+    def clear(self):
+        self._filled[:] = False
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": int(self._filled.sum()),
+            "max_entries": self.max_entries,
+            "step": self.step,
+            "bytes": self._table.nbytes,
+        }
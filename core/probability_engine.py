@@ -1,13 +1,49 @@
 import math
 
+import numpy as np
+
+from core.closed_form import odd_total_prob, skellam_pmf_matrix, total_goals_cdf
+from core.poisson_cache import PoissonPMFCache
+from core.score_distribution import ScoreDistribution
+
+LEAGUE_AVG_HOME = 1.45
+LEAGUE_AVG_AWAY = 1.15
+MIN_XG = 0.3
+HT_XG_SHARE = 0.42
+LATE_GOAL_SHARE = 0.4
+FT_MAX_GOALS = 7
+HT_MAX_GOALS = 5
+MAX_GRID_GOALS = 20
+TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+REPORT_LINES = (0.5, 1.5, 2.5, 3.5)
+
+REPORT_KEYS = (
+    "home", "draw", "away", "over_05", "over_15", "over_25", "over_35",
+    "btts_yes", "btts_no", "clean_sheet_home", "clean_sheet_away", "odd_goals", "even_goals",
+    "ht_home", "ht_draw", "ht_away", "ht_over_05", "ht_over_15", "late_goal",
+)
+
+
+def _line_key(prefix: str, line: float) -> str:
+    return f"{prefix}_{round(line * 10):02d}"
+
 
 class ProbabilityEngine:
+    def __init__(self, pmf_step: float = 0.005, pmf_cache_size: int = 2048,
+                 tail_tolerance: float | None = 1e-6, max_grid_goals: int = MAX_GRID_GOALS,
+                 fast_mode: bool = False, score_table=None):
+        self.fast_mode = fast_mode
+        self.score_table = score_table
+        self.tail_tolerance = tail_tolerance
+        self.max_grid_goals = max_grid_goals
+        self.pmf_cache = PoissonPMFCache(step=pmf_step, max_entries=pmf_cache_size, max_goals=max_grid_goals)
+
     def _poisson_prob(self, lam: float, k: int) -> float:
         if lam <= 0:
             return 1.0 if k == 0 else 0.0
         return (lam ** k) * math.exp(-lam) / math.factorial(k)
 
-    def _poisson_grid(self, home_xg: float, away_xg: float, max_goals: int = 7) -> list[list[float]]:
+    def _poisson_grid(self, home_xg: float, away_xg: float, max_goals: int = FT_MAX_GOALS) -> list[list[float]]:
         grid = []
         for h in range(max_goals + 1):
             row = []
@@ -16,7 +52,7 @@ class ProbabilityEngine:
             grid.append(row)
         return grid
 
-    def calculate_probs(self, features: dict) -> dict:
+    def _expected_goals(self, features: dict) -> tuple[float, float]:
         home_form = features.get("home_form_avg", 0.4)
         away_form = features.get("away_form_avg", 0.3)
         position_gap = features.get("position_gap", 0)
@@ -24,90 +60,176 @@ class ProbabilityEngine:
         away_scored_avg = features.get("away_scored_avg", 1.0)
         home_conceded_avg = features.get("home_conceded_avg", 1.0)
         away_conceded_avg = features.get("away_conceded_avg", 1.3)
-        defensive_strength = features.get("defensive_strength", 0.5)
-
-        league_avg_home = 1.45
-        league_avg_away = 1.15
 
-        home_att = (home_scored_avg / league_avg_home) if league_avg_home > 0 else 1.0
-        home_def = (home_conceded_avg / league_avg_away) if league_avg_away > 0 else 1.0
-        away_att = (away_scored_avg / league_avg_away) if league_avg_away > 0 else 1.0
-        away_def = (away_conceded_avg / league_avg_home) if league_avg_home > 0 else 1.0
+        home_att = (home_scored_avg / LEAGUE_AVG_HOME) if LEAGUE_AVG_HOME > 0 else 1.0
+        home_def = (home_conceded_avg / LEAGUE_AVG_AWAY) if LEAGUE_AVG_AWAY > 0 else 1.0
+        away_att = (away_scored_avg / LEAGUE_AVG_AWAY) if LEAGUE_AVG_AWAY > 0 else 1.0
+        away_def = (away_conceded_avg / LEAGUE_AVG_HOME) if LEAGUE_AVG_HOME > 0 else 1.0
 
-        home_xg = home_att * away_def * league_avg_home
-        away_xg = away_att * home_def * league_avg_away
+        home_xg = home_att * away_def * LEAGUE_AVG_HOME
+        away_xg = away_att * home_def * LEAGUE_AVG_AWAY
 
         form_adj = (home_form - 0.4) * 0.3 - (away_form - 0.3) * 0.2
         pos_adj = position_gap * 0.02
-        home_xg = max(0.3, home_xg + form_adj + pos_adj * 0.1)
-        away_xg = max(0.3, away_xg - form_adj - pos_adj * 0.1)
-
-        grid = self._poisson_grid(home_xg, away_xg)
-        mg = len(grid)
-
-        grid_total = sum(grid[h][a] for h in range(mg) for a in range(mg))
-
-        home_win = sum(grid[h][a] for h in range(mg) for a in range(mg) if h > a) / grid_total
-        draw = sum(grid[h][a] for h in range(mg) for a in range(mg) if h == a) / grid_total
-        away_win = sum(grid[h][a] for h in range(mg) for a in range(mg) if h < a) / grid_total
-
-        under_1 = sum(grid[h][a] for h in range(mg) for a in range(mg) if h + a <= 0) / grid_total
-        under_2 = sum(grid[h][a] for h in range(mg) for a in range(mg) if h + a <= 1) / grid_total
-        under_3 = sum(grid[h][a] for h in range(mg) for a in range(mg) if h + a <= 2) / grid_total
-        under_4 = sum(grid[h][a] for h in range(mg) for a in range(mg) if h + a <= 3) / grid_total
-
-        over_05 = 1.0 - under_1
-        over_15 = 1.0 - under_2
-        over_25 = 1.0 - under_3
-        over_35 = 1.0 - under_4
-
-        home_scores_zero = sum(grid[0][a] for a in range(mg)) / grid_total
-        away_scores_zero = sum(grid[h][0] for h in range(mg)) / grid_total
-        btts_yes = 1.0 - home_scores_zero - away_scores_zero + (grid[0][0] / grid_total)
-        btts_no = 1.0 - btts_yes
-
-        clean_sheet_home = away_scores_zero
-        clean_sheet_away = home_scores_zero
-
-        odd_goals = sum(grid[h][a] for h in range(mg) for a in range(mg) if (h + a) % 2 == 1) / grid_total
-        even_goals = 1.0 - odd_goals
-
-        ht_home_xg = home_xg * 0.42
-        ht_away_xg = away_xg * 0.42
-        ht_grid = self._poisson_grid(ht_home_xg, ht_away_xg, max_goals=5)
-        ht_mg = len(ht_grid)
-        ht_grid_total = sum(ht_grid[h][a] for h in range(ht_mg) for a in range(ht_mg))
-
-        ht_home_win = sum(ht_grid[h][a] for h in range(ht_mg) for a in range(ht_mg) if h > a) / ht_grid_total
-        ht_draw = sum(ht_grid[h][a] for h in range(ht_mg) for a in range(ht_mg) if h == a) / ht_grid_total
-        ht_away_win = sum(ht_grid[h][a] for h in range(ht_mg) for a in range(ht_mg) if h < a) / ht_grid_total
-
-        ht_over_05 = 1.0 - (ht_grid[0][0] / ht_grid_total)
-        ht_over_15 = 1.0 - sum(ht_grid[h][a] for h in range(ht_mg) for a in range(ht_mg) if h + a <= 1) / ht_grid_total
-
-        second_half_xg = (home_xg + away_xg) * 0.58
-        late_goal_prob = 1.0 - math.exp(-second_half_xg * 0.4)
-
-        return {
-            "home": round(home_win, 4),
-            "draw": round(draw, 4),
-            "away": round(away_win, 4),
-            "over_05": round(over_05, 4),
-            "over_15": round(over_15, 4),
-            "over_25": round(over_25, 4),
-            "over_35": round(over_35, 4),
-            "btts_yes": round(btts_yes, 4),
-            "btts_no": round(btts_no, 4),
-            "clean_sheet_home": round(clean_sheet_home, 4),
-            "clean_sheet_away": round(clean_sheet_away, 4),
-            "odd_goals": round(odd_goals, 4),
-            "even_goals": round(even_goals, 4),
-            "ht_home": round(ht_home_win, 4),
-            "ht_draw": round(ht_draw, 4),
-            "ht_away": round(ht_away_win, 4),
-            "ht_over_05": round(ht_over_05, 4),
-            "ht_over_15": round(ht_over_15, 4),
-            "late_goal": round(late_goal_prob, 4),
-            "home_xg": round(home_xg, 2),
-            "away_xg": round(away_xg, 2),
+        home_xg = max(MIN_XG, home_xg + form_adj + pos_adj * 0.1)
+        away_xg = max(MIN_XG, away_xg - form_adj - pos_adj * 0.1)
+        return home_xg, away_xg
+
+    def calculate_probs(self, features: dict) -> dict:
+        return self.calculate_probs_batch([features])[0]
+
+    def calculate_probs_batch(self, features_list: list[dict], diagnostics: bool = False) -> list[dict]:
+        if not features_list:
+            return []
+
+        home_xg, away_xg = self._expected_goals_batch(features_list)
+        ft_grids, ft_goals = self._poisson_grid_batch(home_xg, away_xg, FT_MAX_GOALS)
+        ft = ScoreDistribution.from_grids(ft_grids)
+        ht = None
+
+        if self.fast_mode:
+            columns = self._closed_form_columns(home_xg, away_xg, REPORT_LINES)
+            columns.update(self._closed_form_columns(
+                home_xg * HT_XG_SHARE, away_xg * HT_XG_SHARE, (0.5, 1.5), prefix="ht_", odd_even=False
+            ))
+        else:
+            ht_grids, ht_goals = self._poisson_grid_batch(home_xg * HT_XG_SHARE, away_xg * HT_XG_SHARE, HT_MAX_GOALS)
+            ht = ScoreDistribution.from_grids(ht_grids)
+            columns = self._grid_columns(ft, ht)
+
+        btts_yes = ft.both_score()
+        second_half_xg = (home_xg + away_xg) * (1.0 - HT_XG_SHARE)
+        columns.update({
+            "btts_yes": btts_yes,
+            "btts_no": 1.0 - btts_yes,
+            "clean_sheet_home": ft.clean_sheet_home(),
+            "clean_sheet_away": ft.clean_sheet_away(),
+            "late_goal": 1.0 - np.exp(-second_half_xg * LATE_GOAL_SHARE),
+        })
+
+        reports = self._build_reports(columns, REPORT_KEYS, home_xg, away_xg)
+        if diagnostics:
+            for i, report in enumerate(reports):
+                report["ft_grid_goals"] = int(ft_goals[i])
+                report["ft_truncated_mass"] = float(ft.truncated_mass[i])
+                if ht is not None:
+                    report["ht_grid_goals"] = int(ht_goals[i])
+                    report["ht_truncated_mass"] = float(ht.truncated_mass[i])
+        return reports
+
+    def calculate_headline_probs_batch(self, features_list: list[dict],
+                                       lines: tuple = TOTAL_LINES) -> list[dict]:
+        if not features_list:
+            return []
+
+        home_xg, away_xg = self._expected_goals_batch(features_list)
+        columns = self._closed_form_columns(home_xg, away_xg, lines, with_under=True)
+        return self._build_reports(columns, tuple(columns), home_xg, away_xg)
+
+    def _expected_goals_batch(self, features_list: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+        xgs = np.array([self._expected_goals(f) for f in features_list], dtype=np.float64).reshape(-1, 2)
+        return xgs[:, 0], xgs[:, 1]
+
+    def _poisson_grid_batch(self, home_xg: np.ndarray, away_xg: np.ndarray,
+                            max_goals: int) -> tuple[np.ndarray, np.ndarray]:
+        # Returns the grids and each match's own grid size. Every match is sized from
+        # its own tail mass; cells past that size are zero padding up to the batch width.
+        if self.score_table is not None:
+            return self._table_grid_batch(home_xg, away_xg), np.full(len(home_xg), self.score_table.max_goals)
+
+        home_pmf = self.pmf_cache.get_many(home_xg)
+        away_pmf = self.pmf_cache.get_many(away_xg)
+        if self.tail_tolerance is not None:
+            goals = np.maximum(self._goals_needed(home_pmf), self._goals_needed(away_pmf))
+        else:
+            goals = np.full(len(home_xg), max_goals)
+        goals = np.minimum(goals, self.max_grid_goals)
+        width = int(goals.max()) + 1
+        keep = np.arange(width)[None, :] <= goals[:, None]
+        home_pmf = np.where(keep, home_pmf[:, :width], 0.0)
+        away_pmf = np.where(keep, away_pmf[:, :width], 0.0)
+        return home_pmf[:, :, None] * away_pmf[:, None, :], goals
+
+    def _table_grid_batch(self, home_xg: np.ndarray, away_xg: np.ndarray) -> np.ndarray:
+        table = self.score_table
+        inside = table.contains(home_xg, away_xg)
+        grids = np.empty((len(home_xg), table.max_goals + 1, table.max_goals + 1))
+        if inside.any():
+            grids[inside] = table.lookup(home_xg[inside], away_xg[inside])
+        if not inside.all():
+            outside = ~inside
+            pmf_h = self.pmf_cache.get_many(home_xg[outside])[:, :table.max_goals + 1]
+            pmf_a = self.pmf_cache.get_many(away_xg[outside])[:, :table.max_goals + 1]
+            grids[outside] = pmf_h[:, :, None] * pmf_a[:, None, :]
+        return grids
+
+    def _goals_needed(self, pmf: np.ndarray) -> np.ndarray:
+        # Per row: the fewest goals whose cumulative mass reaches 1 - tolerance.
+        reached = np.cumsum(pmf, axis=1) >= 1.0 - self.tail_tolerance
+        return np.where(reached.any(axis=1), reached.argmax(axis=1), pmf.shape[1] - 1)
+
+    def _diff_range(self, home_xg: np.ndarray, away_xg: np.ndarray) -> np.ndarray:
+        if self.tail_tolerance is None:
+            return np.full(len(home_xg), self.max_grid_goals)
+        pmf = self.pmf_cache.get_many(np.maximum(home_xg, away_xg))
+        return np.minimum(self._goals_needed(pmf), self.max_grid_goals)
+
+    def cache_info(self) -> dict:
+        return self.pmf_cache.cache_info()
+
+    def _grid_columns(self, ft: ScoreDistribution, ht: ScoreDistribution) -> dict:
+        odd_goals = ft.odd_goals()
+        columns = {
+            "home": ft.home_win(),
+            "draw": ft.draw(),
+            "away": ft.away_win(),
+            "odd_goals": odd_goals,
+            "even_goals": 1.0 - odd_goals,
+            "ht_home": ht.home_win(),
+            "ht_draw": ht.draw(),
+            "ht_away": ht.away_win(),
+            "ht_over_05": ht.over(0.5),
+            "ht_over_15": ht.over(1.5),
+        }
+        for line in REPORT_LINES:
+            columns[_line_key("over", line)] = ft.over(line)
+        return columns
+
+    def _closed_form_columns(self, home_xg: np.ndarray, away_xg: np.ndarray, lines: tuple,
+                             prefix: str = "", with_under: bool = False, odd_even: bool = True) -> dict:
+        ranges = self._diff_range(home_xg, away_xg)
+        max_diff = int(ranges.max())
+        diff = skellam_pmf_matrix(home_xg, away_xg, max_diff)
+        # Each match keeps only the goal differences inside its own range.
+        diff = np.where(np.abs(np.arange(-max_diff, max_diff + 1))[None, :] <= ranges[:, None], diff, 0.0)
+        total_xg = home_xg + away_xg
+        cdf = total_goals_cdf(total_xg, max(math.floor(max(lines)), 0))
+
+        columns = {
+            f"{prefix}home": diff[:, max_diff + 1:].sum(axis=1),
+            f"{prefix}draw": diff[:, max_diff],
+            f"{prefix}away": diff[:, :max_diff].sum(axis=1),
         }
+        for line in lines:
+            under = cdf[:, math.ceil(line) - 1] if line > 0 else np.zeros(len(total_xg))
+            columns[prefix + _line_key("over", line)] = 1.0 - cdf[:, math.floor(line)]
+            if with_under:
+                columns[prefix + _line_key("under", line)] = under
+        if odd_even:
+            odd = odd_total_prob(total_xg)
+            columns[f"{prefix}odd_goals"] = odd
+            columns[f"{prefix}even_goals"] = 1.0 - odd
+        return columns
+
+    def _build_reports(self, columns: dict, keys: tuple,
+                       home_xg: np.ndarray, away_xg: np.ndarray) -> list[dict]:
+        rows = np.array([columns[k] for k in keys]).T.round(4).tolist()
+        xg_rows = np.array([home_xg, away_xg]).T.round(2).tolist()
+
+        reports = []
+        for row, (hxg, axg) in zip(rows, xg_rows):
+            report = dict(zip(keys, row))
+            report["home_xg"] = hxg
+            report["away_xg"] = axg
+            reports.append(report)
+        return reports
@@ -0,0 +1,124 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _projection(max_goals: int) -> np.ndarray:
+    size = max_goals + 1
+    h, a = np.divmod(np.arange(size * size), size)
+    n_bins = 2 * max_goals + 1
+    proj = np.zeros((size * size, 2 * n_bins + 2 * size))
+    cells = np.arange(size * size)
+    proj[cells, h - a + max_goals] = 1.0
+    proj[cells, n_bins + h + a] = 1.0
+    proj[cells, 2 * n_bins + h] = 1.0
+    proj[cells, 2 * n_bins + size + a] = 1.0
+    return proj
+
+
+class ScoreDistribution:
+    def __init__(self, cells: np.ndarray, by_diff: np.ndarray, by_total: np.ndarray,
+                 home_goals: np.ndarray, away_goals: np.ndarray, truncated_mass: np.ndarray | None = None):
+        self.cells = cells
+        self.by_diff = by_diff
+        self.by_total = by_total
+        self.home_goals = home_goals
+        self.away_goals = away_goals
+        self.max_goals = cells.shape[1] - 1
+        self.cum_total = np.cumsum(by_total, axis=1)
+        self.truncated_mass = truncated_mass if truncated_mass is not None else np.zeros(cells.shape[0])
+
+    @classmethod
+    def from_grids(cls, grids) -> "ScoreDistribution":
+        grids = np.asarray(grids, dtype=np.float64)
+        if grids.ndim == 2:
+            grids = grids[None]
+        n, size, _ = grids.shape
+        max_goals = size - 1
+        n_bins = 2 * max_goals + 1
+
+        flat = grids.reshape(n, -1)
+        totals = flat.sum(axis=1, keepdims=True)
+        acc = (flat @ _projection(max_goals)) / totals
+
+        return cls(
+            cells=grids / totals[:, :, None],
+            by_diff=acc[:, :n_bins],
+            by_total=acc[:, n_bins:2 * n_bins],
+            home_goals=acc[:, 2 * n_bins:2 * n_bins + size],
+            away_goals=acc[:, 2 * n_bins + size:],
+            truncated_mass=np.clip(1.0 - totals[:, 0], 0.0, 1.0),
+        )
+
+    def __len__(self) -> int:
+        return self.cells.shape[0]
+
+    def home_win(self) -> np.ndarray:
+        return self.by_diff[:, self.max_goals + 1:].sum(axis=1)
+
+    def draw(self) -> np.ndarray:
+        return self.by_diff[:, self.max_goals]
+
+    def away_win(self) -> np.ndarray:
+        return self.by_diff[:, :self.max_goals].sum(axis=1)
+
+    def under(self, line: float) -> np.ndarray:
+        last = math.ceil(line) - 1
+        if last < 0:
+            return np.zeros(len(self))
+        return self.cum_total[:, min(last, self.cum_total.shape[1] - 1)]
+
+    def over(self, line: float) -> np.ndarray:
+        last = math.floor(line)
+        if last < 0:
+            return np.ones(len(self))
+        return 1.0 - self.cum_total[:, min(last, self.cum_total.shape[1] - 1)]
+
+    def odd_goals(self) -> np.ndarray:
+        return self.by_total[:, 1::2].sum(axis=1)
+
+    def both_score(self) -> np.ndarray:
+        return 1.0 - self.home_goals[:, 0] - self.away_goals[:, 0] + self.cells[:, 0, 0]
+
+    def clean_sheet_home(self) -> np.ndarray:
+        return self.away_goals[:, 0]
+
+    def clean_sheet_away(self) -> np.ndarray:
+        return self.home_goals[:, 0]
+
+    def correct_score(self, home: int, away: int) -> np.ndarray:
+        if home > self.max_goals or away > self.max_goals:
+            return np.zeros(len(self))
+        return self.cells[:, home, away]
+
+    def winning_margin(self, margin: int, or_more: bool = False) -> np.ndarray:
+        diffs = np.arange(-self.max_goals, self.max_goals + 1)
+        if margin == 0:
+            return self.draw()
+        if or_more:
+            mask = diffs >= margin if margin > 0 else diffs <= margin
+        else:
+            mask = diffs == margin
+        return self.by_diff[:, mask].sum(axis=1)
+
+    def team_total_over(self, side: str, line: float) -> np.ndarray:
+        marginal = self.home_goals if side == "home" else self.away_goals
+        goals = np.arange(marginal.shape[1])
+        return marginal[:, goals > line].sum(axis=1)
+
+    def asian_handicap(self, line: float) -> dict:
+        # Quarter lines split the stake across the two neighbouring half/whole lines.
+        if (line * 4) % 2 == 1:
+            lower = self.asian_handicap(line - 0.25)
+            upper = self.asian_handicap(line + 0.25)
+            return {k: (lower[k] + upper[k]) / 2 for k in ("win", "push", "lose")}
+
+        diffs = np.arange(-self.max_goals, self.max_goals + 1)
+        adjusted = diffs + line
+        return {
+            "win": self.by_diff[:, adjusted > 0].sum(axis=1),
+            "push": self.by_diff[:, np.isclose(adjusted, 0)].sum(axis=1),
+            "lose": self.by_diff[:, adjusted < 0].sum(axis=1),
+        }
@@ -0,0 +1,142 @@
+import argparse
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from core.poisson_cache import poisson_pmf_matrix
+
+DEFAULT_XG_MIN = 0.10
+DEFAULT_XG_MAX = 4.50
+DEFAULT_STEP = 0.01
+DEFAULT_MAX_GOALS = 10
+
+
+def _meta_path(path) -> Path:
+    return Path(path).with_suffix(".json")
+
+
+def build_score_table(path, xg_min: float = DEFAULT_XG_MIN, xg_max: float = DEFAULT_XG_MAX,
+                      step: float = DEFAULT_STEP, max_goals: int = DEFAULT_MAX_GOALS) -> Path:
+    # Stores raw (unnormalized) Poisson score grids for every (home_xg, away_xg) lattice point.
+    # Half-time grids are read from the same lattice at the scaled half-time xG.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = int(round((xg_max - xg_min) / step)) + 1
+    lattice = xg_min + step * np.arange(n)
+    pmf = poisson_pmf_matrix(lattice, max_goals)
+
+    table = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32, shape=(n, n, max_goals + 1, max_goals + 1)
+    )
+    for i in range(n):
+        table[i] = pmf[i][None, :, None] * pmf[:, None, :]
+    table.flush()
+    del table
+
+    _meta_path(path).write_text(json.dumps({
+        "xg_min": xg_min,
+        "step": step,
+        "size": n,
+        "max_goals": max_goals,
+    }))
+    return path
+
+
+class ScoreTable:
+    def __init__(self, table: np.ndarray, xg_min: float, step: float):
+        self.table = table
+        self.xg_min = xg_min
+        self.step = step
+        self.size = table.shape[0]
+        self.max_goals = table.shape[2] - 1
+        self.xg_max = xg_min + step * (self.size - 1)
+
+    @classmethod
+    def open(cls, path) -> "ScoreTable":
+        meta = json.loads(_meta_path(path).read_text())
+        table = np.load(path, mmap_mode="r")
+        return cls(table, meta["xg_min"], meta["step"])
+
+    def contains(self, home_xg: np.ndarray, away_xg: np.ndarray) -> np.ndarray:
+        lo, hi = self.xg_min, self.xg_max
+        return (home_xg >= lo) & (home_xg <= hi) & (away_xg >= lo) & (away_xg <= hi)
+
+    def lookup(self, home_xg, away_xg) -> np.ndarray:
+        home_xg = np.asarray(home_xg, dtype=np.float64)
+        away_xg = np.asarray(away_xg, dtype=np.float64)
+        x = np.clip((home_xg - self.xg_min) / self.step, 0, self.size - 1)
+        y = np.clip((away_xg - self.xg_min) / self.step, 0, self.size - 1)
+        i0 = np.minimum(np.floor(x).astype(np.int64), self.size - 2)
+        j0 = np.minimum(np.floor(y).astype(np.int64), self.size - 2)
+        fx = (x - i0)[:, None, None]
+        fy = (y - j0)[:, None, None]
+
+        t = self.table
+        return (
+            t[i0, j0] * ((1 - fx) * (1 - fy))
+            + t[i0 + 1, j0] * (fx * (1 - fy))
+            + t[i0, j0 + 1] * ((1 - fx) * fy)
+            + t[i0 + 1, j0 + 1] * (fx * fy)
+        )
+
+
+@lru_cache(maxsize=4)
+def load_score_table(path: str) -> ScoreTable:
+    return ScoreTable.open(path)
+
+
+def check_accuracy(table: ScoreTable, samples: int = 2000, seed: int = 0) -> dict:
+    from core.probability_engine import ProbabilityEngine
+
+    engine = ProbabilityEngine()
+    rng = random.Random(seed)
+    max_cell_error = 0.0
+    max_market_error = 0.0
+    for _ in range(samples):
+        home_xg = rng.uniform(table.xg_min, table.xg_max)
+        away_xg = rng.uniform(table.xg_min, table.xg_max)
+        exact = np.array(engine._poisson_grid(home_xg, away_xg, max_goals=table.max_goals))
+        approx = table.lookup([home_xg], [away_xg])[0]
+        exact /= exact.sum()
+        approx /= approx.sum()
+        max_cell_error = max(max_cell_error, float(np.abs(exact - approx).max()))
+
+        h, a = np.indices(exact.shape)
+        for mask in (h > a, h == a, h < a, h + a > 2):
+            max_market_error = max(max_market_error, abs(float(exact[mask].sum() - approx[mask].sum())))
+
+    return {
+        "samples": samples,
+        "max_cell_error": max_cell_error,
+        "max_market_error": max_market_error,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build or verify the precomputed score-grid table")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build")
+    build.add_argument("path")
+    build.add_argument("--xg-min", type=float, default=DEFAULT_XG_MIN)
+    build.add_argument("--xg-max", type=float, default=DEFAULT_XG_MAX)
+    build.add_argument("--step", type=float, default=DEFAULT_STEP)
+    build.add_argument("--max-goals", type=int, default=DEFAULT_MAX_GOALS)
+
+    check = sub.add_parser("check")
+    check.add_argument("path")
+    check.add_argument("--samples", type=int, default=2000)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        path = build_score_table(args.path, args.xg_min, args.xg_max, args.step, args.max_goals)
+        print(f"Score table written to {path}")
+    else:
+        print(check_accuracy(ScoreTable.open(args.path), samples=args.samples))
+
+
+if __name__ == "__main__":
+    main()
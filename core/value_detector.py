@@ -1,33 +1,32 @@
+import numpy as np
+
+from core import market_registry
+from core.devig import devig
+
+_BOOKMAKER = np.zeros(market_registry.MARKET_COUNT, dtype=bool)
+_BOOKMAKER[market_registry.BOOKMAKER_IDS] = True
+_MODEL_ONLY = np.zeros(market_registry.MARKET_COUNT, dtype=bool)
+_MODEL_ONLY[market_registry.MODEL_ONLY_IDS] = True
+MIN_MODEL_ONLY_PROB = 0.05
+
+
 class ValueDetector:
-    def __init__(self, min_edge: float = 0.05):
+    def __init__(self, min_edge: float = 0.05, devig_method: str | None = None):
         self.min_edge = min_edge
+        self.devig_method = devig_method
 
     def find_edge(self, pred_prob: float, market_prob: float) -> float:
         return pred_prob - market_prob
 
     def evaluate_all_markets(self, probs: dict, odds: dict, features: dict = None) -> list[dict]:
         markets = []
+        fair = self.bookmaker_implied(market_registry.odds_vector(odds))[0] if self.devig_method else None
 
-        market_map = {
-            "HOME_WIN": ("home", "home_odds", "1x2"),
-            "DRAW": ("draw", "draw_odds", "1x2"),
-            "AWAY_WIN": ("away", "away_odds", "1x2"),
-            "OVER_2.5": ("over_25", "over_25_odds", "totals"),
-            "UNDER_2.5": (None, "under_25_odds", "totals"),
-            "OVER_1.5": ("over_15", "over_15_odds", "totals"),
-            "UNDER_1.5": (None, "under_15_odds", "totals"),
-            "OVER_3.5": ("over_35", "over_35_odds", "totals"),
-            "UNDER_3.5": (None, "under_35_odds", "totals"),
-        }
-
-        for bet_type, (prob_key, odds_key, market_key) in market_map.items():
-            if prob_key is None:
-                base = bet_type.replace("UNDER_", "OVER_")
-                over_prob_key = market_map.get(base, (None,))[0]
-                if over_prob_key and over_prob_key in probs:
-                    pred_prob = 1.0 - probs[over_prob_key]
-                else:
+        for market_id, bet_type, market_key, prob_key, complement, odds_key in market_registry.BOOKMAKER_MARKETS:
+            if complement:
+                if prob_key not in probs:
                     continue
+                pred_prob = 1.0 - probs[prob_key]
             else:
                 pred_prob = probs.get(prob_key, 0)
 
@@ -35,10 +34,10 @@ class ValueDetector:
             if not decimal_odds or decimal_odds <= 1:
                 continue
 
-            implied_prob = 1.0 / decimal_odds
+            implied_prob = 1.0 / decimal_odds if fair is None else float(fair[market_id])
             edge = self.find_edge(pred_prob, implied_prob)
             if edge >= self.min_edge:
-                consistency = self._get_consistency(bet_type, features) if features else 0.5
+                consistency = self._get_consistency(bet_type, features)
                 markets.append({
                     "bet_type": bet_type,
                     "market_key": market_key,
@@ -51,40 +50,11 @@ class ValueDetector:
                     "consistency": round(consistency, 4),
                 })
 
-        TYPICAL_ODDS = {
-            "BTTS_YES": 1.80,
-            "BTTS_NO": 1.95,
-            "CLEAN_SHEET_HOME": 2.50,
-            "CLEAN_SHEET_AWAY": 3.00,
-            "ODD_GOALS": 1.90,
-            "EVEN_GOALS": 1.90,
-            "HT_HOME": 2.80,
-            "HT_DRAW": 2.00,
-            "HT_AWAY": 4.50,
-            "HT_OVER_0.5": 1.40,
-            "LATE_GOAL": 2.20,
-        }
-
-        model_only_markets = {
-            "BTTS_YES": ("btts_yes", "btts"),
-            "BTTS_NO": ("btts_no", "btts"),
-            "CLEAN_SHEET_HOME": ("clean_sheet_home", "clean_sheet"),
-            "CLEAN_SHEET_AWAY": ("clean_sheet_away", "clean_sheet"),
-            "ODD_GOALS": ("odd_goals", "odd_even"),
-            "EVEN_GOALS": ("even_goals", "odd_even"),
-            "HT_HOME": ("ht_home", "half_time"),
-            "HT_DRAW": ("ht_draw", "half_time"),
-            "HT_AWAY": ("ht_away", "half_time"),
-            "HT_OVER_0.5": ("ht_over_05", "half_time"),
-            "LATE_GOAL": ("late_goal", "late_goal"),
-        }
-
-        for bet_type, (prob_key, market_key) in model_only_markets.items():
+        for bet_type, market_key, prob_key, reference_odds in market_registry.MODEL_ONLY_MARKETS:
             pred_prob = probs.get(prob_key, 0)
-            if pred_prob < 0.05:
+            if pred_prob < MIN_MODEL_ONLY_PROB:
                 continue
 
-            reference_odds = TYPICAL_ODDS.get(bet_type, 2.0)
             implied_prob = 1.0 / reference_odds
 
             edge = pred_prob - implied_prob
@@ -92,7 +62,7 @@ class ValueDetector:
                 continue
 
             fair_odds = round(1.0 / pred_prob, 2) if pred_prob > 0 else 0
-            consistency = self._get_consistency(bet_type, features) if features else 0.5
+            consistency = self._get_consistency(bet_type, features)
 
             markets.append({
                 "bet_type": bet_type,
@@ -109,44 +79,98 @@ class ValueDetector:
         markets.sort(key=lambda x: x["edge"], reverse=True)
         return markets
 
-    def _get_consistency(self, bet_type: str, features: dict) -> float:
-        if not features:
-            return 0.5
-
-        mapping = {
-            "HOME_WIN": "home_form_avg",
-            "AWAY_WIN": "away_form_avg",
-            "DRAW": None,
-            "OVER_2.5": "over_25_home_rate",
-            "OVER_1.5": "over_15_home_rate",
-            "OVER_3.5": "over_35_home_rate",
-            "BTTS_YES": "btts_home_rate",
-            "BTTS_NO": None,
-            "CLEAN_SHEET_HOME": "clean_sheet_home_rate",
-            "CLEAN_SHEET_AWAY": "clean_sheet_away_rate",
-            "ODD_GOALS": "odd_goals_rate",
-            "EVEN_GOALS": None,
-            "HT_HOME": None,
-            "HT_DRAW": None,
-            "HT_AWAY": None,
-            "HT_OVER_0.5": None,
-            "LATE_GOAL": "late_goal_home_rate",
+    def evaluate_batch(self, probs: np.ndarray, odds: np.ndarray) -> dict:
+        # probs and odds are (N matches x M markets) in registry order, NaN where missing.
+        # Markets without bookmaker odds are priced against the registry's reference odds.
+        probs = np.atleast_2d(np.asarray(probs, dtype=np.float64))
+        odds = np.atleast_2d(np.asarray(odds, dtype=np.float64))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            has_odds = _BOOKMAKER & (odds > 1)
+            use_reference = _MODEL_ONLY & (probs >= MIN_MODEL_ONLY_PROB)
+            implied = np.where(
+                has_odds,
+                self.bookmaker_implied(odds),
+                np.where(use_reference, 1.0 / market_registry.TYPICAL_ODDS, np.nan),
+            )
+            edges = probs - implied
+            fair_odds = np.where(probs > 0, 1.0 / probs, 0.0)
+
+        return {
+            "probs": probs,
+            "odds": np.where(has_odds, odds, fair_odds),
+            "implied_probs": implied,
+            "edges": edges,
+            "is_value": edges >= self.min_edge,
+            "has_bookmaker_odds": has_odds,
         }
 
-        feat_key = mapping.get(bet_type)
-        if feat_key and feat_key in features:
-            return features[feat_key]
-
-        if bet_type == "BTTS_NO":
-            r = features.get("btts_home_rate", 0.5)
-            return 1.0 - r
-        if bet_type == "EVEN_GOALS":
-            r = features.get("odd_goals_rate", 0.5)
-            return 1.0 - r
-        if bet_type.startswith("UNDER_"):
-            over_bt = bet_type.replace("UNDER_", "OVER_")
-            over_key = mapping.get(over_bt)
-            if over_key and over_key in features:
-                return 1.0 - features[over_key]
-
-        return 0.5
+    def bookmaker_implied(self, odds: np.ndarray) -> np.ndarray:
+        # Implied probabilities with the margin removed per book (1X2, each totals line)
+        # when a devig method is set. Incomplete books keep the raw 1 / odds.
+        odds = np.atleast_2d(np.asarray(odds, dtype=np.float64))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            implied = np.where(odds > 1, 1.0 / odds, np.nan)
+        if not self.devig_method:
+            return implied
+        for ids in market_registry.BOOKS:
+            fair = devig(odds[:, ids], self.devig_method)
+            complete = np.isfinite(fair).all(axis=1)
+            implied[np.ix_(complete, ids)] = fair[complete]
+        return implied
+
+    def top_markets(self, evaluation: dict, k: int | None = None) -> np.ndarray:
+        # (N, k) market ids ordered by edge (ties keep registry order); -1 pads rows
+        # with fewer than k value markets.
+        score = np.where(evaluation["is_value"], np.round(evaluation["edges"], 4), -np.inf)
+        n, m = score.shape
+        k = m if k is None else min(k, m)
+        if k < m:
+            idx = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.broadcast_to(np.arange(m), (n, m))
+        picked = np.take_along_axis(score, idx, axis=1)
+        order = np.lexsort((idx, -picked), axis=-1)
+        idx = np.take_along_axis(idx, order, axis=1)
+        return np.where(np.take_along_axis(score, idx, axis=1) > -np.inf, idx, -1)
+
+    def evaluate_all_markets_batch(self, probs_list: list[dict], odds_list: list[dict],
+                                   features_list: list[dict] | None = None) -> list[list[dict]]:
+        if not probs_list:
+            return []
+        features_list = features_list or [None] * len(probs_list)
+        evaluation = self.evaluate_batch(
+            market_registry.prob_matrix(probs_list),
+            market_registry.odds_matrix(odds_list),
+        )
+        ranked = self.top_markets(evaluation).tolist()
+        probs = evaluation["probs"].tolist()
+        odds = evaluation["odds"].tolist()
+        implied = evaluation["implied_probs"].tolist()
+        edges = evaluation["edges"].tolist()
+        has_odds = evaluation["has_bookmaker_odds"].tolist()
+
+        results = []
+        for row, features in enumerate(features_list):
+            markets = []
+            for i in ranked[row]:
+                if i < 0:
+                    break
+                bet_type = market_registry.BET_TYPES[i]
+                bookmaker = has_odds[row][i]
+                markets.append({
+                    "bet_type": bet_type,
+                    "market_key": market_registry.MARKET_KEYS[bet_type],
+                    "predicted_prob": round(probs[row][i], 4),
+                    "implied_prob": round(implied[row][i], 4),
+                    "odds": odds[row][i] if bookmaker else round(odds[row][i], 2),
+                    "edge": round(edges[row][i], 4),
+                    "is_value": True,
+                    "has_bookmaker_odds": bookmaker,
+                    "consistency": round(self._get_consistency(bet_type, features), 4),
+                })
+            results.append(markets)
+        return results
+
+    def _get_consistency(self, bet_type: str, features: dict) -> float:
+        return market_registry.consistency(bet_type, features)
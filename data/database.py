@@ -1,8 +1,37 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from config.settings import settings
 
-engine = create_async_engine(settings.db_url, echo=False)
+
+def _sqlite_pragmas(read_only: bool):
+    def apply(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        if not read_only and settings.SQLITE_WAL:
+            # WAL is stored in the file: readers never block the writer and vice versa.
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return apply
+
+
+def _make_engine(url: str, read_only: bool = False):
+    db_engine = create_async_engine(url, echo=False)
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+    return db_engine
+
+
+# Writer for the daily cycle, pipeline and admin actions; a separate read-only
+# engine serves bot views so they never queue behind a long write transaction.
+engine = _make_engine(settings.db_url)
+read_engine = _make_engine(settings.db_url, read_only=True)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -10,6 +39,12 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -23,9 +58,18 @@ async def init_db():
     from data.models.bankroll import BankrollHistory
     from data.models.pattern_stat import PatternStat
     from data.models.standing_snapshot import StandingSnapshot
+    from data.models.current_standing import CurrentStanding
+    from data.models.team_alias import TeamAlias
+    from data.migrations import run_migrations
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
+
+
+async def close_db():
+    await read_engine.dispose()
+    await engine.dispose()
 
 
 async def get_session() -> AsyncSession:
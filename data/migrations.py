@@ -0,0 +1,135 @@
+import logging
+from datetime import datetime
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Indexes for the repository hot paths; the models declare the same ones so fresh
+# databases get them from create_all.
+HOT_PATH_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_matches_status_date ON matches (status, utc_date)",
+    "CREATE INDEX IF NOT EXISTS ix_matches_home_status_date ON matches (home_team_id, status, utc_date)",
+    "CREATE INDEX IF NOT EXISTS ix_matches_away_status_date ON matches (away_team_id, status, utc_date)",
+    "CREATE INDEX IF NOT EXISTS ix_matches_matchday ON matches (matchday, utc_date)",
+    "CREATE INDEX IF NOT EXISTS ix_odds_match_recorded ON odds_history (match_id, recorded_at)",
+    "CREATE INDEX IF NOT EXISTS ix_signals_match_rank ON signals (match_id, rank_in_match)",
+    "CREATE INDEX IF NOT EXISTS ix_signals_result_won ON signals (result_won)",
+    "CREATE INDEX IF NOT EXISTS ix_signals_created_at ON signals (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_standings_snapshot_date ON standings_snapshots (snapshot_date)",
+    "CREATE INDEX IF NOT EXISTS ix_bankroll_timestamp ON bankroll_history (timestamp, id)",
+)
+
+
+async def _ensure_column(conn, table: str, column: str, ddl: str):
+    # create_all never alters existing tables; add columns introduced after a DB was created.
+    columns = await conn.execute(text(f"PRAGMA table_info({table})"))
+    if column not in {row[1] for row in columns}:
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+async def add_analysis_fingerprint(conn):
+    await _ensure_column(conn, "matches", "analysis_fingerprint", "VARCHAR(64)")
+
+
+async def signal_unique_index(conn):
+    # Databases created before the (match_id, suggested_bet) constraint may hold
+    # duplicates; keep the settled row if any, otherwise the newest.
+    exists = await conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_signals_match_bet'"
+    ))
+    if exists.first():
+        return
+    await conn.execute(text("""
+        DELETE FROM signals WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY match_id, suggested_bet
+                    ORDER BY result_won IS NULL, id DESC
+                ) AS rn
+                FROM signals
+            ) WHERE rn = 1
+        )
+    """))
+    await conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_signals_match_bet ON signals (match_id, suggested_bet)"
+    ))
+
+
+async def hot_path_indexes(conn):
+    for statement in HOT_PATH_INDEXES:
+        await conn.execute(text(statement))
+
+
+async def compact_standings(conn):
+    # Standings history keeps one row per team and matchday (legacy rows use games
+    # played as their matchday, newest snapshot wins); current_standings is seeded
+    # from the latest snapshot.
+    await _ensure_column(conn, "standings_snapshots", "matchday", "INTEGER")
+    await conn.execute(text("UPDATE standings_snapshots SET matchday = played WHERE matchday IS NULL"))
+    await conn.execute(text("""
+        DELETE FROM standings_snapshots WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY team_id, matchday ORDER BY snapshot_date DESC, id DESC
+                ) AS rn
+                FROM standings_snapshots
+            ) WHERE rn = 1
+        )
+    """))
+    await conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_standings_team_matchday ON standings_snapshots (team_id, matchday)"
+    ))
+    await conn.execute(text("""
+        INSERT OR IGNORE INTO current_standings (
+            team_id, position, played, wins, draws, losses, points,
+            goals_for, goals_against, goal_diff, snapshot_date
+        )
+        SELECT team_id, position, played, wins, draws, losses, points,
+               goals_for, goals_against, goal_diff, snapshot_date
+        FROM standings_snapshots
+        WHERE snapshot_date = (SELECT MAX(snapshot_date) FROM standings_snapshots)
+    """))
+
+
+async def drop_guessed_aliases(conn):
+    # Earlier resolvers stored token-overlap guesses as permanent aliases, some of
+    # them wrong. Automatic mappings are re-derived on the next sync, so drop them
+    # all; admin mappings and unresolved names stay.
+    await conn.execute(text("DELETE FROM team_aliases WHERE source = 'auto' AND team_id IS NOT NULL"))
+
+
+# Append only: a migration's number and body never change once released.
+MIGRATIONS = (
+    (1, "matches.analysis_fingerprint column", add_analysis_fingerprint),
+    (2, "signals unique (match_id, suggested_bet)", signal_unique_index),
+    (3, "hot-path indexes", hot_path_indexes),
+    (4, "current standings and compacted standings history", compact_standings),
+    (5, "drop guessed team aliases", drop_guessed_aliases),
+)
+
+
+async def current_version(conn) -> int:
+    result = await conn.execute(text("SELECT MAX(version) FROM schema_version"))
+    return result.scalar() or 0
+
+
+async def run_migrations(conn) -> int:
+    # Runs inside the caller's transaction, so a failed migration leaves the
+    # database and schema_version untouched.
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at DATETIME NOT NULL)"
+    ))
+    version = await current_version(conn)
+    applied = 0
+    for number, name, migrate in MIGRATIONS:
+        if number <= version:
+            continue
+        logger.info(f"Applying migration {number}: {name}")
+        await migrate(conn)
+        await conn.execute(
+            text("INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :t)"),
+            {"v": number, "n": name, "t": datetime.utcnow()},
+        )
+        applied += 1
+    return applied
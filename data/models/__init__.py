@@ -5,3 +5,5 @@ from data.models.signal import Signal
 from data.models.bankroll import BankrollHistory
 from data.models.pattern_stat import PatternStat
 from data.models.standing_snapshot import StandingSnapshot
+from data.models.current_standing import CurrentStanding
+from data.models.team_alias import TeamAlias
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 from datetime import datetime
 from data.database import Base
 
 
 class BankrollHistory(Base):
     __tablename__ = "bankroll_history"
+    __table_args__ = (
+        Index("ix_bankroll_timestamp", "timestamp", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
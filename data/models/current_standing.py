@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from data.database import Base
+
+
+class CurrentStanding(Base):
+    # The latest table only, one row per team; replaced as a whole on each update.
+    __tablename__ = "current_standings"
+
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+
+    position = Column(Integer, index=True)
+    played = Column(Integer)
+    wins = Column(Integer, default=0)
+    draws = Column(Integer, default=0)
+    losses = Column(Integer, default=0)
+    points = Column(Integer)
+    goals_for = Column(Integer)
+    goals_against = Column(Integer)
+    goal_diff = Column(Integer)
+
+    snapshot_date = Column(DateTime, default=datetime.utcnow)
+
+    team = relationship("Team")
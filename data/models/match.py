@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from data.database import Base
 
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        Index("ix_matches_status_date", "status", "utc_date"),
+        Index("ix_matches_home_status_date", "home_team_id", "status", "utc_date"),
+        Index("ix_matches_away_status_date", "away_team_id", "status", "utc_date"),
+        Index("ix_matches_matchday", "matchday", "utc_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     external_id = Column(Integer, unique=True)
@@ -24,6 +30,7 @@ class Match(Base):
     predicted_home_win_prob = Column(Float, nullable=True)
     predicted_draw_prob = Column(Float, nullable=True)
     predicted_away_win_prob = Column(Float, nullable=True)
+    analysis_fingerprint = Column(String(64), nullable=True)
 
     home_team = relationship("Team", foreign_keys=[home_team_id], back_populates="home_matches")
     away_team = relationship("Team", foreign_keys=[away_team_id], back_populates="away_matches")
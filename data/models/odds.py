@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from data.database import Base
@@ -6,6 +6,9 @@ from data.database import Base
 
 class Odds(Base):
     __tablename__ = "odds_history"
+    __table_args__ = (
+        Index("ix_odds_match_recorded", "match_id", "recorded_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
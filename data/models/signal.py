@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from data.database import Base
@@ -6,6 +6,12 @@ from data.database import Base
 
 class Signal(Base):
     __tablename__ = "signals"
+    __table_args__ = (
+        Index("ux_signals_match_bet", "match_id", "suggested_bet", unique=True),
+        Index("ix_signals_match_rank", "match_id", "rank_in_match"),
+        Index("ix_signals_result_won", "result_won"),
+        Index("ix_signals_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     match_id = Column(Integer, ForeignKey("matches.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from data.database import Base
@@ -6,9 +6,15 @@ from data.database import Base
 
 class StandingSnapshot(Base):
     __tablename__ = "standings_snapshots"
+    # History, compacted to one row per team and matchday.
+    __table_args__ = (
+        Index("ix_standings_snapshot_date", "snapshot_date"),
+        Index("ux_standings_team_matchday", "team_id", "matchday", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    matchday = Column(Integer, nullable=True)
 
     position = Column(Integer)
     played = Column(Integer)
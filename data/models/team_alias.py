@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from data.database import Base
+
+
+class TeamAlias(Base):
+    __tablename__ = "team_aliases"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    alias = Column(String, unique=True, nullable=False)
+    raw_name = Column(String, nullable=False)
+    # NULL team_id marks a name nothing resolved to, waiting for an admin mapping.
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
+    source = Column(String, default="auto")
+    seen_count = Column(Integer, default=1)
+    last_seen = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from datetime import datetime
 from data.models.bankroll import BankrollHistory
 from config.settings import settings
 
@@ -11,7 +12,7 @@ class BankrollRepository:
     async def get_current_balance(self) -> float:
         result = await self.session.execute(
             select(BankrollHistory)
-            .order_by(BankrollHistory.timestamp.desc())
+            .order_by(BankrollHistory.timestamp.desc(), BankrollHistory.id.desc())
             .limit(1)
         )
         entry = result.scalar_one_or_none()
@@ -20,7 +21,7 @@ class BankrollRepository:
     async def get_history(self, limit: int = 20) -> list[BankrollHistory]:
         result = await self.session.execute(
             select(BankrollHistory)
-            .order_by(BankrollHistory.timestamp.desc())
+            .order_by(BankrollHistory.timestamp.desc(), BankrollHistory.id.desc())
             .limit(limit)
         )
         return list(result.scalars().all())
@@ -36,6 +37,17 @@ class BankrollRepository:
         await self.session.flush()
         return entry
 
+    async def append_entries(self, entries: list[dict]):
+        # entries: {"balance", "pnl", "stake", "match_id"} in ledger order. One
+        # multi-row insert sharing the real timestamp; ids follow insert order, and
+        # the reads break timestamp ties on id.
+        if not entries:
+            return
+        now = datetime.utcnow()
+        await self.session.execute(
+            BankrollHistory.__table__.insert(), [dict(entry, timestamp=now) for entry in entries]
+        )
+
     async def initialize_if_empty(self):
         result = await self.session.execute(
             select(BankrollHistory).limit(1)
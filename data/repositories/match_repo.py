@@ -1,9 +1,15 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from data.models.match import Match
 from datetime import datetime
 
+SYNC_COLUMNS = (
+    "external_id", "utc_date", "status", "matchday", "home_team_id", "away_team_id",
+    "home_score", "away_score", "home_ht_score", "away_ht_score",
+)
+
 
 class MatchRepository:
     def __init__(self, session: AsyncSession):
@@ -64,6 +70,37 @@ class MatchRepository:
         )
         return list(result.scalars().all())
 
+    async def get_home_matches_for_teams(self, team_ids, limit: int = 10) -> dict[int, list[Match]]:
+        return await self._last_finished_by_team(Match.home_team_id, team_ids, limit)
+
+    async def get_away_matches_for_teams(self, team_ids, limit: int = 10) -> dict[int, list[Match]]:
+        return await self._last_finished_by_team(Match.away_team_id, team_ids, limit)
+
+    async def _last_finished_by_team(self, team_column, team_ids, limit: int) -> dict[int, list[Match]]:
+        team_ids = set(team_ids)
+        if not team_ids:
+            return {}
+        ranked = (
+            select(
+                Match.id,
+                func.row_number().over(
+                    partition_by=team_column, order_by=Match.utc_date.desc()
+                ).label("rn"),
+            )
+            .where(Match.status == "FINISHED", team_column.in_(team_ids))
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(Match)
+            .join(ranked, ranked.c.id == Match.id)
+            .where(ranked.c.rn <= limit)
+            .order_by(team_column, Match.utc_date.desc())
+        )
+        by_team = {team_id: [] for team_id in team_ids}
+        for match in result.scalars().all():
+            by_team[getattr(match, team_column.key)].append(match)
+        return by_team
+
     async def upsert(self, match_data: dict) -> Match:
         result = await self.session.execute(
             select(Match).where(Match.external_id == match_data["external_id"])
@@ -80,6 +117,25 @@ class MatchRepository:
         await self.session.flush()
         return match
 
+    async def get_sync_state(self) -> dict[int, dict]:
+        result = await self.session.execute(
+            select(Match.id, *(getattr(Match, c) for c in SYNC_COLUMNS))
+            .where(Match.external_id != None)
+        )
+        return {row.external_id: row._asdict() for row in result.all()}
+
+    async def upsert_many(self, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+        # Core table insert: the ORM bulk path splits the batch wherever a row has NULLs.
+        stmt = sqlite_insert(Match.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Match.__table__.c.external_id],
+            set_={c: stmt.excluded[c] for c in SYNC_COLUMNS if c != "external_id"},
+        )
+        await self.session.execute(stmt, rows)
+        return len(rows)
+
     async def get_recent_finished(self, limit: int = 15) -> list[Match]:
         result = await self.session.execute(
             select(Match)
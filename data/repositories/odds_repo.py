@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from data.models.odds import Odds
 
 
@@ -24,6 +24,39 @@ class OddsRepository:
         )
         return list(result.scalars().all())
 
+    async def get_latest_for_matches(self, match_ids) -> dict[int, Odds]:
+        match_ids = set(match_ids)
+        if not match_ids:
+            return {}
+        ranked = (
+            select(
+                Odds.id,
+                func.row_number().over(
+                    partition_by=Odds.match_id, order_by=Odds.recorded_at.desc()
+                ).label("rn"),
+            )
+            .where(Odds.match_id.in_(match_ids))
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(Odds).join(ranked, ranked.c.id == Odds.id).where(ranked.c.rn == 1)
+        )
+        return {odds.match_id: odds for odds in result.scalars().all()}
+
+    async def get_all_for_matches(self, match_ids) -> dict[int, list[Odds]]:
+        match_ids = set(match_ids)
+        if not match_ids:
+            return {}
+        result = await self.session.execute(
+            select(Odds)
+            .where(Odds.match_id.in_(match_ids))
+            .order_by(Odds.match_id, Odds.recorded_at)
+        )
+        by_match = {match_id: [] for match_id in match_ids}
+        for odds in result.scalars().all():
+            by_match[odds.match_id].append(odds)
+        return by_match
+
     async def add_snapshot(self, odds_data: dict) -> Odds:
         new_odds = Odds(**odds_data)
         self.session.add(new_odds)
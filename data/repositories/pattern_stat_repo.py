@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime
 from data.models.pattern_stat import PatternStat
 
 
@@ -17,6 +19,9 @@ class PatternStatRepository:
         result = await self.session.execute(select(PatternStat))
         return list(result.scalars().all())
 
+    async def get_all_by_name(self) -> dict[str, PatternStat]:
+        return {stat.pattern_name: stat for stat in await self.get_all()}
+
     async def update_reliability(self, name: str, is_win: bool) -> PatternStat:
         stat = await self.get_by_name(name)
         if not stat:
@@ -37,3 +42,34 @@ class PatternStatRepository:
 
         await self.session.flush()
         return stat
+
+    async def apply_deltas(self, deltas: dict[str, tuple[int, int]]):
+        # deltas: pattern name -> (wins, losses) to add; one upsert for the whole batch.
+        if not deltas:
+            return
+        table = PatternStat.__table__
+        stmt = sqlite_insert(table)
+        occurrences = table.c.occurrences + stmt.excluded.occurrences
+        wins = table.c.wins + stmt.excluded.wins
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.pattern_name],
+            set_={
+                "occurrences": occurrences,
+                "wins": wins,
+                "losses": table.c.losses + stmt.excluded.losses,
+                "reliability_score": wins * 1.0 / occurrences,
+                "last_updated": stmt.excluded.last_updated,
+            },
+        )
+        now = datetime.utcnow()
+        await self.session.execute(stmt, [
+            {
+                "pattern_name": name,
+                "occurrences": won + lost,
+                "wins": won,
+                "losses": lost,
+                "reliability_score": won / (won + lost),
+                "last_updated": now,
+            }
+            for name, (won, lost) in deltas.items()
+        ])
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, delete, update, bindparam
+from sqlalchemy.orm import selectinload, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from data.models.signal import Signal
 from data.models.match import Match
 from datetime import datetime, timedelta
@@ -125,11 +127,59 @@ class SignalRepository:
         )
         return list(result.scalars().all())
 
+    async def get_by_match_ids(self, match_ids) -> dict[int, list[Signal]]:
+        match_ids = set(match_ids)
+        if not match_ids:
+            return {}
+        result = await self.session.execute(
+            select(Signal)
+            .where(Signal.match_id.in_(match_ids))
+            .order_by(Signal.match_id, Signal.rank_in_match)
+        )
+        by_match = {match_id: [] for match_id in match_ids}
+        for signal in result.scalars().all():
+            by_match[signal.match_id].append(signal)
+        return by_match
+
     async def add(self, signal: Signal) -> Signal:
         self.session.add(signal)
         await self.session.flush()
         return signal
 
+    async def add_many(self, rows: list[dict], chunk_size: int = 500) -> list[Signal]:
+        # One multi-row INSERT ... ON CONFLICT(match_id, suggested_bet) per chunk.
+        # Settled signals and signals the user has placed are never overwritten.
+        signals = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            stmt = sqlite_insert(Signal).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Signal.match_id, Signal.suggested_bet],
+                set_={
+                    key: stmt.excluded[key]
+                    for key in chunk[0] if key not in ("match_id", "suggested_bet")
+                },
+                where=Signal.result_won.is_(None) & Signal.is_published.is_(False),
+            )
+            result = await self.session.scalars(
+                stmt.returning(Signal), execution_options={"populate_existing": True}
+            )
+            signals.extend(result.all())
+        return signals
+
+    async def delete_pending_for_matches(self, match_ids, keep_ids=()):
+        match_ids = set(match_ids)
+        if not match_ids:
+            return
+        await self.session.execute(
+            delete(Signal).where(
+                Signal.match_id.in_(match_ids),
+                Signal.result_won == None,
+                Signal.is_published.is_(False),
+                Signal.id.not_in(set(keep_ids)),
+            )
+        )
+
     async def mark_published(self, signal_id: int):
         result = await self.session.execute(
             select(Signal).where(Signal.id == signal_id)
@@ -171,3 +221,31 @@ class SignalRepository:
             "losses": total_count - win_count,
             "win_rate": (win_count / total_count * 100) if total_count > 0 else 0,
         }
+
+    async def get_pending_for_finished(self) -> list[Signal]:
+        # Unsettled signals on finished, scored matches, with the match loaded in the same query.
+        result = await self.session.execute(
+            select(Signal)
+            .join(Signal.match)
+            .where(
+                Signal.result_won == None,
+                Match.status == "FINISHED",
+                Match.home_score != None,
+                Match.away_score != None,
+            )
+            .options(contains_eager(Signal.match))
+            .order_by(Match.utc_date, Signal.match_id, Signal.id)
+        )
+        return list(result.unique().scalars().all())
+
+    async def set_results(self, signals: list[Signal], results: list[bool]):
+        if not signals:
+            return
+        table = Signal.__table__
+        await self.session.execute(
+            update(table).where(table.c.id == bindparam("signal_id")).values(result_won=bindparam("won")),
+            [{"signal_id": s.id, "won": won} for s, won in zip(signals, results)],
+        )
+        # Keep loaded objects in step without marking them dirty (no second UPDATE on flush).
+        for signal, won in zip(signals, results):
+            set_committed_value(signal, "result_won", won)
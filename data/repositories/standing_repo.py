@@ -1,21 +1,56 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import selectinload
 from data.models.standing_snapshot import StandingSnapshot
+from data.models.current_standing import CurrentStanding
+
+TABLE_COLUMNS = (
+    "position", "played", "wins", "draws", "losses", "points",
+    "goals_for", "goals_against", "goal_diff", "snapshot_date",
+)
 
 
 class StandingRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_latest(self) -> list[StandingSnapshot]:
-        result = await self.session.execute(
-            select(StandingSnapshot)
-            .options(selectinload(StandingSnapshot.team))
-            .order_by(StandingSnapshot.position)
+    async def get_latest(self, load_teams: bool = True) -> list[CurrentStanding]:
+        # populate_existing: rows already in the session may predate a replace_current.
+        stmt = (
+            select(CurrentStanding)
+            .order_by(CurrentStanding.position)
+            .execution_options(populate_existing=True)
+        )
+        if load_teams:
+            stmt = stmt.options(selectinload(CurrentStanding.team))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def replace_current(self, rows: list[dict]) -> int:
+        # Delete and refill inside the caller's transaction: readers see either the
+        # old table or the new one, never a mix.
+        if not rows:
+            return 0
+        await self.session.execute(delete(CurrentStanding))
+        await self.session.execute(
+            insert(CurrentStanding.__table__),
+            [{"team_id": r["team_id"], **{c: r.get(c) for c in TABLE_COLUMNS}} for r in rows],
+        )
+        return len(rows)
+
+    async def record_history(self, rows: list[dict]) -> int:
+        # One history row per (team, matchday); a re-fetch within the same
+        # matchday overwrites it instead of appending.
+        if not rows:
+            return 0
+        stmt = sqlite_insert(StandingSnapshot.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StandingSnapshot.__table__.c.team_id, StandingSnapshot.__table__.c.matchday],
+            set_={c: stmt.excluded[c] for c in TABLE_COLUMNS},
+        )
+        await self.session.execute(
+            stmt,
+            [{"team_id": r["team_id"], "matchday": r["matchday"], **{c: r.get(c) for c in TABLE_COLUMNS}} for r in rows],
         )
-        snapshots = list(result.scalars().all())
-        if not snapshots:
-            return []
-        latest_date = max(s.snapshot_date for s in snapshots)
-        return [s for s in snapshots if s.snapshot_date == latest_date]
+        return len(rows)
@@ -0,0 +1,47 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from data.models.team_alias import TeamAlias
+
+
+class TeamAliasRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> list[TeamAlias]:
+        result = await self.session.execute(select(TeamAlias))
+        return list(result.scalars().all())
+
+    async def get_unresolved(self) -> list[TeamAlias]:
+        result = await self.session.execute(
+            select(TeamAlias)
+            .where(TeamAlias.team_id == None)
+            .order_by(TeamAlias.seen_count.desc())
+        )
+        return list(result.scalars().all())
+
+    async def record_many(self, rows: list[dict]):
+        # rows: {"alias", "raw_name", "team_id", "source", "seen_count", "last_seen"}
+        if not rows:
+            return
+        table = TeamAlias.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.alias],
+            set_={
+                # A name recorded as unresolved picks up a later resolution; existing
+                # mappings (including admin ones) are never overwritten.
+                "team_id": case((table.c.team_id == None, stmt.excluded.team_id), else_=table.c.team_id),
+                "source": case((table.c.team_id == None, stmt.excluded.source), else_=table.c.source),
+                "seen_count": table.c.seen_count + stmt.excluded.seen_count,
+                "last_seen": stmt.excluded.last_seen,
+            },
+        )
+        await self.session.execute(stmt, rows)
+
+    async def map_alias(self, alias: str, team_id: int):
+        await self.session.execute(
+            update(TeamAlias)
+            .where(TeamAlias.alias == alias)
+            .values(team_id=team_id, source="admin")
+        )
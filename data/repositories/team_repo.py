@@ -1,7 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from data.models.team import Team
 
+SYNC_COLUMNS = ("external_id", "name", "short_name", "tla")
+
 
 class TeamRepository:
     def __init__(self, session: AsyncSession):
@@ -27,3 +30,21 @@ class TeamRepository:
             self.session.add(team)
         await self.session.flush()
         return team
+
+    async def get_sync_state(self) -> dict[int, dict]:
+        # external_id -> {"id", *SYNC_COLUMNS} without loading ORM objects
+        result = await self.session.execute(
+            select(Team.id, *(getattr(Team, c) for c in SYNC_COLUMNS))
+        )
+        return {row.external_id: row._asdict() for row in result.all()}
+
+    async def upsert_many(self, rows: list[dict]) -> int:
+        if not rows:
+            return 0
+        stmt = sqlite_insert(Team.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Team.__table__.c.external_id],
+            set_={c: stmt.excluded[c] for c in SYNC_COLUMNS if c != "external_id"},
+        )
+        await self.session.execute(stmt, rows)
+        return len(rows)
@@ -2,10 +2,12 @@ import asyncio
 import logging
 from utils.logging import setup_logging
 from config.settings import settings
-from data.database import init_db, AsyncSessionLocal
+from data.database import init_db, close_db, AsyncSessionLocal
 from data.repositories.bankroll_repo import BankrollRepository
 from bot.bot_factory import create_bot, create_dispatcher
 from services.scheduling.daily_runner import DailyRunner
+from services.processing.signal_compute import shutdown_executor
+from services.data_fetch.http_client import close_clients
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 setup_logging()
@@ -71,6 +73,10 @@ async def main():
                 await asyncio.sleep(3600)
         except (KeyboardInterrupt, SystemExit):
             scheduler.shutdown()
+        finally:
+            shutdown_executor()
+            await close_clients()
+            await close_db()
         return
 
     bot = create_bot(token)
@@ -88,6 +94,9 @@ async def main():
         await dp.start_polling(bot)
     finally:
         scheduler.shutdown()
+        shutdown_executor()
+        await close_clients()
+        await close_db()
         await bot.session.close()
         logger.info("Bot shut down cleanly")
 
@@ -1,6 +1,11 @@
 import httpx
 import logging
 from config.settings import settings
+from services.data_fetch.http_client import get_client
+from services.data_fetch.response_cache import get_response_cache
+from services.data_fetch.rate_limiter import (
+    PRIORITY_BACKFILL, PRIORITY_CYCLE, get_rate_limiter, parse_retry_after,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,27 +16,75 @@ class FootballDataService:
         token = settings.FOOTBALL_DATA_API_KEY.get_secret_value()
         self.headers = {"X-Auth-Token": token} if token else {}
 
-    async def _get(self, endpoint: str) -> dict | None:
-        async with httpx.AsyncClient(headers=self.headers, timeout=30) as client:
+    async def _get(self, endpoint: str, priority: int = PRIORITY_CYCLE) -> dict | None:
+        cache = get_response_cache()
+        cached = await cache.get(endpoint) if cache else None
+        if cached and cache.is_fresh(cached, endpoint):
+            return cached["body"]
+        headers = dict(self.headers, **cache.validators(cached)) if cached else self.headers
+
+        client = get_client(self.base_url, timeout=settings.FOOTBALL_DATA_TIMEOUT)
+        limiter = get_rate_limiter("football-data", settings.FOOTBALL_DATA_RATE_LIMIT)
+        for attempt in range(settings.FOOTBALL_DATA_MAX_RETRIES + 1):
+            await limiter.acquire(priority)
+            try:
+                response = await client.get(f"{self.base_url}/{endpoint}", headers=headers)
+            except Exception as e:
+                logger.error(f"Connection Error: {e}")
+                return self._stale(cached, endpoint)
+
+            reset = self._header_int(response, "X-RequestCounter-Reset")
+            limiter.observe(self._header_int(response, "X-Requests-Available-Minute"), reset)
+
+            if response.status_code == 429 and attempt < settings.FOOTBALL_DATA_MAX_RETRIES:
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = reset if reset is not None else 60.0
+                logger.warning(f"Rate limited on {endpoint}, retrying in {delay:.0f}s")
+                limiter.pause(delay)
+                continue
+
+            if response.status_code == 304 and cached:
+                await cache.touch(endpoint, cached, response)
+                return cached["body"]
+
             try:
-                response = await client.get(f"{self.base_url}/{endpoint}")
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
             except httpx.HTTPStatusError as e:
                 logger.error(f"API Error: {e.response.status_code} for {endpoint}")
+                if e.response.status_code == 429 or e.response.status_code >= 500:
+                    return self._stale(cached, endpoint)
                 return None
             except Exception as e:
-                logger.error(f"Connection Error: {e}")
+                logger.error(f"Invalid response for {endpoint}: {e}")
                 return None
+            if cache:
+                await cache.put(endpoint, response, data)
+            return data
+
+    @staticmethod
+    def _stale(cached: dict | None, endpoint: str) -> dict | None:
+        # A transient failure serves the last body on disk rather than emptying the cycle.
+        if not cached:
+            return None
+        logger.warning(f"Serving stale cached {endpoint}")
+        return cached["body"]
+
+    @staticmethod
+    def _header_int(response: httpx.Response, name: str) -> int | None:
+        value = response.headers.get(name)
+        return int(value) if value and value.lstrip("-").isdigit() else None
 
     async def fetch_epl_matches(self, season: str = None) -> dict | None:
         endpoint = "competitions/PL/matches"
         if season:
             endpoint += f"?season={season}"
-        return await self._get(endpoint)
+        # Past seasons are backfill; the current fixture list drives the daily cycle.
+        return await self._get(endpoint, PRIORITY_BACKFILL if season else PRIORITY_CYCLE)
 
     async def fetch_epl_standings(self) -> dict | None:
         return await self._get("competitions/PL/standings")
 
-    async def fetch_team_matches(self, team_id: int) -> dict | None:
-        return await self._get(f"teams/{team_id}/matches?status=FINISHED&limit=15")
+    async def fetch_team_matches(self, team_id: int, priority: int = PRIORITY_BACKFILL) -> dict | None:
+        return await self._get(f"teams/{team_id}/matches?status=FINISHED&limit=15", priority)
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from urllib.parse import urlsplit
+import httpx
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# One pooled client per upstream host, shared by every service instance so
+# connections (and TLS sessions) are reused across requests.
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def get_client(base_url: str, timeout: float | None = None) -> httpx.AsyncClient:
+    host = urlsplit(base_url).netloc
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(host)
+    if entry is not None:
+        client_loop, client = entry
+        # A pool is tied to the loop it was opened on (the admin command and the
+        # tests run their own loops).
+        if client_loop is loop and not client.is_closed:
+            return client
+
+    http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+    client = httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout or settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+    )
+    _clients[host] = (loop, client)
+    logger.debug(f"Opened HTTP client for {host} (http2={http2})")
+    return client
+
+
+async def close_clients():
+    entries = list(_clients.values())
+    _clients.clear()
+    for _, client in entries:
+        if not client.is_closed:
+            await client.aclose()
@@ -1,6 +1,6 @@
-import httpx
 import logging
 from config.settings import settings
+from services.data_fetch.http_client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +21,11 @@ class OddsService:
             "markets": "h2h,totals",
             "oddsFormat": "decimal",
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            try:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Failed to fetch odds: {e}")
-                return []
+        client = get_client(self.base_url, timeout=settings.ODDS_API_TIMEOUT)
+        try:
+            response = await client.get(self.base_url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Failed to fetch odds: {e}")
+            return []
@@ -0,0 +1,114 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_CYCLE = 0
+PRIORITY_BACKFILL = 1
+
+
+class RateLimiter:
+    # Token bucket refilled at rate_per_minute. Waiters are served strictly by
+    # (priority, arrival), so daily-cycle calls overtake queued backfill calls.
+    def __init__(self, rate_per_minute: int, capacity: int | None = None):
+        self.capacity = capacity or rate_per_minute
+        self.refill_per_second = rate_per_minute / 60.0
+        self.tokens = float(self.capacity)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self._updated = max(now, self._updated)
+
+    def _wait_time(self, now: float) -> float:
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return max(0.0, (1.0 - self.tokens) / self.refill_per_second)
+
+    async def acquire(self, priority: int = PRIORITY_CYCLE):
+        entry = (priority, next(self._seq))
+        async with self._cond:
+            heapq.heappush(self._queue, entry)
+            self._cond.notify_all()
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] != entry:
+                        await self._cond.wait()
+                        continue
+                    delay = self._wait_time(now)
+                    if delay <= 0 and self.tokens >= 1:
+                        heapq.heappop(self._queue)
+                        self.tokens -= 1
+                        self._cond.notify_all()
+                        return
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                raise
+
+    def observe(self, available: int | None, reset_seconds: float | None = None):
+        # The server's count wins: other clients may share the same API key.
+        now = time.monotonic()
+        self._refill(now)
+        if available is not None:
+            self.tokens = min(self.tokens, float(available))
+            if available <= 0 and reset_seconds:
+                # Quota exhausted: wait for the counter reset, which restores it in full.
+                self.blocked_until = max(self.blocked_until, now + reset_seconds)
+                self.tokens = float(self.capacity)
+                self._updated = self.blocked_until
+
+    def pause(self, seconds: float):
+        # Nothing goes out until the server's Retry-After has passed; then one
+        # request (the retry) is allowed and the bucket refills from there.
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 1.0
+        self._updated = self.blocked_until
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_limiters: dict[str, tuple[asyncio.AbstractEventLoop, RateLimiter]] = {}
+
+
+def get_rate_limiter(name: str, rate_per_minute: int) -> RateLimiter:
+    loop = asyncio.get_running_loop()
+    entry = _limiters.get(name)
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    limiter = RateLimiter(rate_per_minute)
+    _limiters[name] = (loop, limiter)
+    return limiter
@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+import httpx
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    # Gzipped JSON bodies on disk with their validators. Entries younger than the
+    # endpoint's TTL are served without a request; older ones are revalidated with
+    # If-None-Match / If-Modified-Since and a 304 is answered from disk.
+    def __init__(self, directory: str, ttls: dict[str, int] | None = None, default_ttl: int = 0):
+        self.directory = Path(directory)
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json.gz"
+
+    def ttl_for(self, endpoint: str) -> int:
+        matches = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    def is_fresh(self, entry: dict, endpoint: str) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl_for(endpoint)
+
+    @staticmethod
+    def validators(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _read(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry for {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write(self, key: str, entry: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    async def get(self, key: str) -> dict | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def put(self, key: str, response: httpx.Response, body) -> dict:
+        entry = {
+            "key": key,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "body": body,
+        }
+        await asyncio.to_thread(self._write, key, entry)
+        return entry
+
+    async def touch(self, key: str, entry: dict, response: httpx.Response) -> dict:
+        # 304: keep the body, take any refreshed validators and restart the TTL.
+        entry = dict(entry, stored_at=time.time())
+        entry["etag"] = response.headers.get("ETag") or entry.get("etag")
+        entry["last_modified"] = response.headers.get("Last-Modified") or entry.get("last_modified")
+        await asyncio.to_thread(self._write, key, entry)
+        return entry
+
+
+def get_response_cache() -> ResponseCache | None:
+    if not settings.HTTP_CACHE_DIR:
+        return None
+    return ResponseCache(settings.HTTP_CACHE_DIR, settings.HTTP_CACHE_TTLS, settings.HTTP_CACHE_DEFAULT_TTL)
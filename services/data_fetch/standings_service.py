@@ -1,10 +1,10 @@
 import logging
 from services.data_fetch.football_data_service import FootballDataService
 from data.repositories.team_repo import TeamRepository
-from data.models.standing_snapshot import StandingSnapshot
+from data.repositories.standing_repo import StandingRepository
+from data.models.current_standing import CurrentStanding
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from datetime import datetime, timedelta
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +14,13 @@ class StandingsService:
         self.session = session
         self.football_service = football_service
         self.team_repo = TeamRepository(session)
+        self.standing_repo = StandingRepository(session)
 
     async def update_standings(self) -> int:
         data = await self.football_service.fetch_epl_standings()
+        return await self.store_standings(data)
+
+    async def store_standings(self, data: dict | None) -> int:
         if not data:
             logger.warning("No standings data received")
             return 0
@@ -34,38 +38,35 @@ class StandingsService:
         if not total_table:
             total_table = standings_list[0].get("table", [])
 
-        count = 0
+        season = data.get("season") or {}
+        team_ids = {ext_id: row["id"] for ext_id, row in (await self.team_repo.get_sync_state()).items()}
         batch_time = datetime.utcnow()
+        rows = []
         for entry in total_table:
-            team_api = entry.get("team", {})
-            team = await self.team_repo.get_by_external_id(team_api.get("id"))
-            if not team:
+            team_id = team_ids.get((entry.get("team") or {}).get("id"))
+            if not team_id:
                 continue
+            played = entry.get("playedGames", 0)
+            rows.append({
+                "team_id": team_id,
+                # Matchday the table reflects; teams with games in hand still share it.
+                "matchday": season.get("currentMatchday") or played,
+                "position": entry.get("position"),
+                "played": played,
+                "wins": entry.get("won", 0),
+                "draws": entry.get("draw", 0),
+                "losses": entry.get("lost", 0),
+                "points": entry.get("points", 0),
+                "goals_for": entry.get("goalsFor", 0),
+                "goals_against": entry.get("goalsAgainst", 0),
+                "goal_diff": entry.get("goalDifference", 0),
+                "snapshot_date": batch_time,
+            })
 
-            snapshot = StandingSnapshot(
-                team_id=team.id,
-                position=entry.get("position"),
-                played=entry.get("playedGames", 0),
-                wins=entry.get("won", 0),
-                draws=entry.get("draw", 0),
-                losses=entry.get("lost", 0),
-                points=entry.get("points", 0),
-                goals_for=entry.get("goalsFor", 0),
-                goals_against=entry.get("goalsAgainst", 0),
-                goal_diff=entry.get("goalDifference", 0),
-                snapshot_date=batch_time,
-            )
-            self.session.add(snapshot)
-            count += 1
-
-        await self.session.flush()
-        logger.info(f"Updated standings for {count} teams")
-        return count
+        await self.standing_repo.record_history(rows)
+        await self.standing_repo.replace_current(rows)
+        logger.info(f"Updated standings for {len(rows)} teams")
+        return len(rows)
 
-    async def get_latest_standings(self) -> list[StandingSnapshot]:
-        result = await self.session.execute(
-            select(StandingSnapshot)
-            .order_by(StandingSnapshot.snapshot_date.desc())
-            .limit(20)
-        )
-        return list(result.scalars().all())
+    async def get_latest_standings(self) -> list[CurrentStanding]:
+        return await self.standing_repo.get_latest(load_teams=False)
@@ -16,43 +16,41 @@ class PerformanceUpdateService:
 
     async def process_match_result(self, match_id: int, actual_outcome: str):
         signals = await self.signal_repo.get_by_match_id(match_id)
-        if not signals:
-            return
-
-        total_pnl = 0.0
-        total_stake = 0.0
-        any_processed = False
-
-        for signal in signals:
-            if signal.result_won is None:
-                continue
-
-            any_processed = True
-            is_win = signal.result_won
-
+        await self.process_settled([(s, s.result_won) for s in signals if s.result_won is not None])
+
+    async def process_settled(self, settled: list[tuple]):
+        # settled: (signal, won) pairs in settlement order. Pattern deltas and the
+        # per-match P&L are gathered in memory and written with one pattern upsert
+        # and one ledger insert.
+        pattern_deltas = {}
+        by_match = {}
+        for signal, is_win in settled:
             if is_win:
                 pnl = signal.recommended_stake * (signal.bookmaker_odds - 1)
             else:
                 pnl = -signal.recommended_stake
-
-            total_pnl += pnl
-            total_stake += signal.recommended_stake
+            match_pnl = by_match.setdefault(signal.match_id, [0.0, 0.0])
+            match_pnl[0] += pnl
+            match_pnl[1] += signal.recommended_stake
 
             if signal.patterns_detected:
                 for pattern_name in signal.patterns_detected.split(","):
-                    await self.pattern_repo.update_reliability(pattern_name.strip(), is_win)
-
-        if any_processed and total_stake > 0:
-            current_bal = await self.bankroll_repo.get_current_balance()
-            new_bal = current_bal + total_pnl
-            await self.bankroll_repo.update_balance(
-                new_balance=new_bal,
-                pnl=total_pnl,
-                stake=total_stake,
-                match_id=match_id,
-            )
+                    wins, losses = pattern_deltas.get(pattern_name.strip(), (0, 0))
+                    pattern_deltas[pattern_name.strip()] = (wins + is_win, losses + (not is_win))
 
+        await self.pattern_repo.apply_deltas(pattern_deltas)
+
+        entries = []
+        balance = None
+        for match_id, (total_pnl, total_stake) in by_match.items():
+            if total_stake <= 0:
+                continue
+            if balance is None:
+                balance = await self.bankroll_repo.get_current_balance()
+            balance += total_pnl
+            entries.append({"balance": balance, "pnl": total_pnl, "stake": total_stake, "match_id": match_id})
             logger.info(
                 f"Result processed for match {match_id}: "
-                f"PnL: {total_pnl:+.2f} | New balance: {new_bal:.2f}"
+                f"PnL: {total_pnl:+.2f} | New balance: {balance:.2f}"
             )
+        await self.bankroll_repo.append_entries(entries)
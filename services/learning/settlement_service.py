@@ -0,0 +1,38 @@
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from core import market_registry
+from data.repositories.signal_repo import SignalRepository
+from services.learning.performance_update_service import PerformanceUpdateService
+
+logger = logging.getLogger(__name__)
+
+
+class SettlementService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.signal_repo = SignalRepository(session)
+        self.perf_service = PerformanceUpdateService(session)
+
+    async def settle_pending(self) -> int:
+        # One read for every pending signal on a finished match, one vectorised pass
+        # over the market registry, one executemany UPDATE for result_won.
+        pending = await self.signal_repo.get_pending_for_finished()
+        if not pending:
+            return 0
+
+        outcomes = market_registry.settle_many(
+            [s.suggested_bet for s in pending],
+            [s.match.home_score for s in pending],
+            [s.match.away_score for s in pending],
+            [s.match.home_ht_score for s in pending],
+            [s.match.away_ht_score for s in pending],
+        )
+        settled = [(s, won) for s, won in zip(pending, outcomes) if won is not None]
+        if not settled:
+            return 0
+        await self.signal_repo.set_results([s for s, _ in settled], [won for _, won in settled])
+
+        await self.perf_service.process_settled(settled)
+
+        logger.info(f"Settled {len(settled)} signals across {len({s.match_id for s, _ in settled})} matches")
+        return len(settled)
@@ -0,0 +1,90 @@
+import hashlib
+import logging
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from data.repositories.match_repo import MatchRepository, SYNC_COLUMNS as MATCH_COLUMNS
+from data.repositories.team_repo import TeamRepository, SYNC_COLUMNS as TEAM_COLUMNS
+from services.processing.match_preprocessor import MatchPreprocessor
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_value(value) -> str:
+    if isinstance(value, datetime):
+        # SQLite hands datetimes back naive; compare everything as naive UTC.
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=" ")
+    return "" if value is None else str(value)
+
+
+def row_hash(row: dict, columns: tuple) -> str:
+    return hashlib.sha1("\x1f".join(_hash_value(row.get(c)) for c in columns).encode()).hexdigest()
+
+
+class MatchSyncService:
+    # Differential sync of the football-data fixture list: existing rows are loaded
+    # once keyed by external_id, and only new or changed rows are written, one
+    # INSERT ... ON CONFLICT DO UPDATE executemany per table.
+    def __init__(self, session: AsyncSession):
+        self.team_repo = TeamRepository(session)
+        self.match_repo = MatchRepository(session)
+        self.preprocessor = MatchPreprocessor()
+
+    async def sync(self, matches_raw: list[dict]) -> dict:
+        teams = self._collect_teams(matches_raw)
+        existing_teams = await self.team_repo.get_sync_state()
+        changed_teams = self._changed(teams, existing_teams, TEAM_COLUMNS)
+        await self.team_repo.upsert_many(changed_teams)
+        if any(t["external_id"] not in existing_teams for t in changed_teams):
+            existing_teams = await self.team_repo.get_sync_state()
+        team_ids = {ext_id: row["id"] for ext_id, row in existing_teams.items()}
+
+        matches = {}
+        for api_match in matches_raw:
+            normalized = self.preprocessor.normalize_match_data(api_match)
+            home_id = team_ids.get(normalized["home_team_external_id"])
+            away_id = team_ids.get(normalized["away_team_external_id"])
+            if not home_id or not away_id:
+                continue
+            row = {c: normalized.get(c) for c in MATCH_COLUMNS}
+            row["home_team_id"], row["away_team_id"] = home_id, away_id
+            matches[row["external_id"]] = row
+
+        changed_matches = self._changed(matches, await self.match_repo.get_sync_state(), MATCH_COLUMNS)
+        await self.match_repo.upsert_many(changed_matches)
+
+        stats = {
+            "teams": len(teams),
+            "matches": len(matches),
+            "teams_written": len(changed_teams),
+            "matches_written": len(changed_matches),
+        }
+        logger.info(
+            f"Synced {stats['teams']} teams ({stats['teams_written']} written), "
+            f"{stats['matches']} matches ({stats['matches_written']} written)"
+        )
+        return stats
+
+    @staticmethod
+    def _collect_teams(matches_raw: list[dict]) -> dict[int, dict]:
+        teams = {}
+        for api_match in matches_raw:
+            for side in ("homeTeam", "awayTeam"):
+                team_data = api_match.get(side) or {}
+                ext_id = team_data.get("id")
+                if ext_id and ext_id not in teams:
+                    teams[ext_id] = {
+                        "external_id": ext_id,
+                        "name": team_data.get("name", "Unknown"),
+                        "short_name": team_data.get("shortName", ""),
+                        "tla": team_data.get("tla", ""),
+                    }
+        return teams
+
+    @staticmethod
+    def _changed(incoming: dict[int, dict], existing: dict[int, dict], columns: tuple) -> list[dict]:
+        return [
+            row for ext_id, row in incoming.items()
+            if ext_id not in existing or row_hash(row, columns) != row_hash(existing[ext_id], columns)
+        ]
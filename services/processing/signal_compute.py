@@ -0,0 +1,283 @@
+import logging
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from services.processing.feature_builder import FeatureBuilder
+from core import market_registry
+from core.probability_engine import ProbabilityEngine
+from core.score_table import load_score_table
+from core.value_detector import ValueDetector
+from core.pattern_engine import PatternEngine
+from core.reliability_tracker import ReliabilityTracker
+from core.market_confidence_engine import MarketConfidenceEngine
+from core.stake_engine import StakeEngine
+from core.signal_engine import SignalEngine
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_SIGNALS_PER_MATCH = 4
+
+# Bump whenever the analysis logic changes in a way that should invalidate
+# previously stored signals.
+MODEL_VERSION = "2026.10.1"
+
+# Plain, picklable stand-ins for the ORM rows the feature builder and pattern
+# engine read, so jobs can cross a process boundary.
+MatchRef = namedtuple("MatchRef", ["id", "home_team_id", "away_team_id"])
+ScoreLine = namedtuple("ScoreLine", ["home_score", "away_score", "home_ht_score", "away_ht_score"])
+StandingRef = namedtuple("StandingRef", ["team_id", "position"])
+
+
+def model_signature() -> str:
+    # Model version plus every setting that changes what the compute stage produces.
+    return "|".join(str(v) for v in (
+        MODEL_VERSION,
+        settings.MIN_VALUE_EDGE,
+        settings.DEVIG_METHOD,
+        settings.DEFAULT_KELLY_FRACTION,
+        settings.MAX_STAKE_PERCENT,
+        settings.CLOSED_FORM_FAST_MODE,
+        settings.GRID_TAIL_TOLERANCE,
+        settings.PMF_CACHE_STEP,
+        settings.SCORE_TABLE_PATH,
+    ))
+
+
+def score_line(match) -> ScoreLine:
+    return ScoreLine(match.home_score, match.away_score, match.home_ht_score, match.away_ht_score)
+
+
+class SignalCompute:
+    def __init__(self):
+        self.feature_builder = FeatureBuilder()
+        self.prob_engine = ProbabilityEngine(
+            pmf_step=settings.PMF_CACHE_STEP,
+            pmf_cache_size=settings.PMF_CACHE_SIZE,
+            tail_tolerance=settings.GRID_TAIL_TOLERANCE,
+            fast_mode=settings.CLOSED_FORM_FAST_MODE,
+            score_table=self._load_score_table(),
+        )
+        self.value_detector = ValueDetector(
+            min_edge=settings.MIN_VALUE_EDGE, devig_method=settings.DEVIG_METHOD or None
+        )
+        self.pattern_engine = PatternEngine()
+        self.reliability_tracker = ReliabilityTracker()
+        self.market_conf_engine = MarketConfidenceEngine()
+        self.stake_engine = StakeEngine(
+            kelly_fraction=settings.DEFAULT_KELLY_FRACTION,
+            max_stake_pct=settings.MAX_STAKE_PERCENT,
+        )
+        self.signal_engine = SignalEngine(min_edge=settings.MIN_VALUE_EDGE)
+
+    def run(self, jobs: list[dict], context: dict) -> list[dict]:
+        # jobs: {"match", "home_history", "away_history", "odds", "odds_history"}
+        # context: {"standings", "bankroll", "pattern_stats"}
+        prepared = []
+        for job in jobs:
+            try:
+                features = self.feature_builder.build_match_features(
+                    job["match"], job["home_history"], job["away_history"], context["standings"]
+                )
+                prepared.append((job, features))
+            except Exception as e:
+                logger.error(f"Error preparing match {job['match'].id}: {e}")
+
+        try:
+            evaluated = self._evaluate_batch(prepared)
+        except Exception as e:
+            # One bad match must not sink the chunk: redo it match by match.
+            logger.warning(f"Batch evaluation failed ({e}), retrying {len(prepared)} matches one at a time")
+            evaluated = []
+            for item in prepared:
+                try:
+                    evaluated.extend(self._evaluate_batch([item]))
+                except Exception as e:
+                    logger.error(f"Error evaluating match {item[0]['match'].id}: {e}")
+
+        results = []
+        for job, features, probs, value_markets in evaluated:
+            try:
+                signals = self._match_signals(job, features, probs, value_markets, context)
+            except Exception as e:
+                logger.error(f"Error analyzing match {job['match'].id}: {e}")
+                continue
+            results.append({"match_id": job["match"].id, "probs": probs, "signals": signals})
+
+        logger.debug(f"PMF cache: {self.prob_engine.cache_info()}")
+        return results
+
+    def _evaluate_batch(self, prepared: list) -> list[tuple]:
+        probs_list = self.prob_engine.calculate_probs_batch([f for _, f in prepared])
+        value_lists = self.value_detector.evaluate_all_markets_batch(
+            probs_list, [job["odds"] for job, _ in prepared], [f for _, f in prepared]
+        )
+        return [
+            (job, features, probs, value_markets)
+            for (job, features), probs, value_markets in zip(prepared, probs_list, value_lists)
+        ]
+
+    def _match_signals(self, job: dict, features: dict, probs: dict, value_markets: list, context: dict) -> list[dict]:
+        patterns = self.pattern_engine.detect_patterns(
+            job["home_history"], job["away_history"], features
+        )
+
+        if not value_markets:
+            return []
+
+        pattern_stats = [
+            context["pattern_stats"][p["name"]]
+            for p in patterns if p["name"] in context["pattern_stats"]
+        ]
+
+        diverse_markets = self._diversify_markets(value_markets, MAX_SIGNALS_PER_MATCH)
+
+        match_signals = []
+        for vm in diverse_markets:
+            relevant_patterns = self._get_relevant_patterns(patterns, vm["bet_type"])
+
+            base_confidence = vm["predicted_prob"]
+            adjusted_confidence = self.reliability_tracker.adjust_confidence(
+                base_confidence, pattern_stats
+            )
+
+            consistency = vm.get("consistency", self._calc_consistency(vm, features))
+
+            pattern_boost = 0.05 * len(relevant_patterns)
+            adjusted_confidence = min(1.0, adjusted_confidence + pattern_boost)
+
+            market_conf = self.market_conf_engine.get_score(
+                vm["bet_type"], job["odds_history"]
+            )
+
+            stake = self.stake_engine.calculate_kelly_stake(
+                context["bankroll"], vm["odds"], adjusted_confidence
+            )
+
+            decision = self.signal_engine.generate_final_decision(
+                prob_report=probs,
+                value_edge=vm["edge"],
+                confidence_score=adjusted_confidence,
+                stake_amount=stake,
+                bet_type=vm["bet_type"],
+                patterns=relevant_patterns,
+                market_confidence=market_conf,
+            )
+
+            if decision["decision"] == "BET":
+                pattern_names = ",".join(p["name"] for p in relevant_patterns) if relevant_patterns else None
+                match_signals.append({
+                    "vm": vm,
+                    "decision": decision,
+                    "pattern_names": pattern_names,
+                    "consistency": consistency,
+                })
+
+        rows = []
+        for rank, sig_data in enumerate(match_signals, 1):
+            vm = sig_data["vm"]
+            decision = sig_data["decision"]
+            rows.append({
+                "match_id": job["match"].id,
+                "market_key": vm.get("market_key", "1x2"),
+                "suggested_bet": decision["bet_type"],
+                "predicted_prob": vm["predicted_prob"],
+                "implied_prob": vm["implied_prob"],
+                "value_edge": decision["edge"],
+                "bookmaker_odds": vm["odds"],
+                "confidence_score": decision["confidence"],
+                "market_confidence": decision["market_confidence"],
+                "recommended_stake": decision["stake"],
+                "consistency_pct": sig_data["consistency"],
+                "rank_in_match": rank,
+                "patterns_detected": sig_data["pattern_names"],
+                "explanation": decision["explanation"],
+            })
+        return rows
+
+    @staticmethod
+    def _load_score_table():
+        path = settings.SCORE_TABLE_PATH
+        if not path:
+            return None
+        if not os.path.exists(path):
+            logger.warning(f"Score table {path} not found, computing grids directly")
+            return None
+        return load_score_table(path)
+
+    def _get_relevant_patterns(self, patterns: list, bet_type: str) -> list:
+        relevant = []
+        for p in patterns:
+            supported_markets = p.get("markets", [])
+            if not supported_markets:
+                relevant.append(p)
+            elif bet_type in supported_markets:
+                relevant.append(p)
+        return relevant
+
+    def _diversify_markets(self, value_markets: list, max_picks: int) -> list:
+        selected = []
+        seen_categories = set()
+
+        for vm in value_markets:
+            category = vm.get("market_key", "1x2")
+            if category not in seen_categories:
+                selected.append(vm)
+                seen_categories.add(category)
+                if len(selected) >= max_picks:
+                    break
+
+        if len(selected) < max_picks:
+            for vm in value_markets:
+                if vm not in selected:
+                    selected.append(vm)
+                    if len(selected) >= max_picks:
+                        break
+
+        return selected
+
+    def _calc_consistency(self, value_market: dict, features: dict) -> float:
+        if not features:
+            return 0.5
+        return market_registry.consistency(
+            value_market["bet_type"], features, default=value_market.get("predicted_prob", 0.5)
+        )
+
+
+_compute = None
+_compute_lock = threading.Lock()
+_executor = None
+
+
+def analyze_chunk(jobs: list[dict], context: dict) -> list[dict]:
+    # Entry point for worker processes; engines (and their caches) live for the
+    # lifetime of the process. In-process runs reach this through to_thread, and
+    # the daily cycle and an admin analysis can overlap, so the shared engines
+    # and their PMF cache are used by one thread at a time.
+    global _compute
+    with _compute_lock:
+        if _compute is None:
+            _compute = SignalCompute()
+        return _compute.run(jobs, context)
+
+
+def get_executor() -> ProcessPoolExecutor | None:
+    global _executor
+    if settings.ANALYSIS_WORKERS <= 0:
+        return None
+    if _executor is None:
+        # spawn: the parent runs an event loop and DB threads that must not be forked
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.ANALYSIS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
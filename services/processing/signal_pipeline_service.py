@@ -1,4 +1,7 @@
+import asyncio
+import hashlib
 import logging
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from data.repositories.match_repo import MatchRepository
 from data.repositories.odds_repo import OddsRepository
@@ -6,21 +9,15 @@ from data.repositories.signal_repo import SignalRepository
 from data.repositories.bankroll_repo import BankrollRepository
 from data.repositories.pattern_stat_repo import PatternStatRepository
 from data.models.signal import Signal
-from services.processing.feature_builder import FeatureBuilder
 from services.data_fetch.standings_service import StandingsService
-from core.probability_engine import ProbabilityEngine
-from core.value_detector import ValueDetector
-from core.pattern_engine import PatternEngine
-from core.reliability_tracker import ReliabilityTracker
-from core.market_confidence_engine import MarketConfidenceEngine
-from core.stake_engine import StakeEngine
-from core.signal_engine import SignalEngine
+from services.processing.signal_compute import (
+    MatchRef, StandingRef, analyze_chunk, get_executor, model_signature, score_line,
+)
+from core import market_registry
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
-MAX_SIGNALS_PER_MATCH = 4
-
 
 class SignalPipelineService:
     def __init__(self, session: AsyncSession, standings_service: StandingsService):
@@ -32,19 +29,7 @@ class SignalPipelineService:
         self.pattern_stat_repo = PatternStatRepository(session)
         self.standings_service = standings_service
 
-        self.feature_builder = FeatureBuilder()
-        self.prob_engine = ProbabilityEngine()
-        self.value_detector = ValueDetector(min_edge=settings.MIN_VALUE_EDGE)
-        self.pattern_engine = PatternEngine()
-        self.reliability_tracker = ReliabilityTracker()
-        self.market_conf_engine = MarketConfidenceEngine()
-        self.stake_engine = StakeEngine(
-            kelly_fraction=settings.DEFAULT_KELLY_FRACTION,
-            max_stake_pct=settings.MAX_STAKE_PERCENT,
-        )
-        self.signal_engine = SignalEngine(min_edge=settings.MIN_VALUE_EDGE)
-
-    async def execute_full_analysis(self) -> list[Signal]:
+    async def execute_full_analysis(self, force: bool = False) -> list[Signal]:
         generated_signals = []
 
         matches = await self.match_repo.get_upcoming()
@@ -54,204 +39,223 @@ class SignalPipelineService:
 
         standings = await self.standings_service.get_latest_standings()
         bankroll = await self.bankroll_repo.get_current_balance()
+        pattern_stats = await self.pattern_stat_repo.get_all_by_name()
 
         logger.info(f"Analyzing {len(matches)} upcoming matches (Bankroll: {bankroll:.2f})")
 
-        for match in matches:
-            try:
-                existing = await self.signal_repo.get_by_match_id(match.id)
-                if existing:
-                    has_old_format = any(s.rank_in_match is None for s in existing)
-                    if has_old_format:
-                        await self.signal_repo.delete_for_match(match.id)
-                    else:
-                        continue
-
-                home_history = await self.match_repo.get_home_matches(match.home_team_id)
-                away_history = await self.match_repo.get_away_matches(match.away_team_id)
-
-                features = self.feature_builder.build_match_features(
-                    match, home_history, away_history, standings
-                )
-
-                probs = self.prob_engine.calculate_probs(features)
-
-                patterns = self.pattern_engine.detect_patterns(
-                    home_history, away_history, features
-                )
-
-                latest_odds = await self.odds_repo.get_latest_for_match(match.id)
-                odds_dict = {}
-                if latest_odds:
-                    odds_dict = {
-                        "home_odds": latest_odds.home_odds,
-                        "draw_odds": latest_odds.draw_odds,
-                        "away_odds": latest_odds.away_odds,
-                        "over_25_odds": latest_odds.over_25_odds,
-                        "under_25_odds": latest_odds.under_25_odds,
-                        "over_15_odds": latest_odds.over_15_odds,
-                        "under_15_odds": latest_odds.under_15_odds,
-                        "over_35_odds": latest_odds.over_35_odds,
-                        "under_35_odds": latest_odds.under_35_odds,
-                    }
-
-                value_markets = self.value_detector.evaluate_all_markets(probs, odds_dict, features)
-
-                if not value_markets:
-                    continue
-
-                pattern_stats = []
-                for p in patterns:
-                    stat = await self.pattern_stat_repo.get_by_name(p["name"])
-                    if stat:
-                        pattern_stats.append({
-                            "win_rate": stat.reliability_score,
-                            "sample_size": stat.occurrences,
-                        })
-
-                odds_snapshots = await self.odds_repo.get_all_for_match(match.id)
-                odds_history_dicts = [
-                    {"home_odds": o.home_odds, "away_odds": o.away_odds}
-                    for o in odds_snapshots
-                ]
-
-                diverse_markets = self._diversify_markets(value_markets, MAX_SIGNALS_PER_MATCH)
-
-                match_signals = []
-                for vm in diverse_markets:
-                    relevant_patterns = self._get_relevant_patterns(patterns, vm["bet_type"])
-
-                    base_confidence = vm["predicted_prob"]
-                    adjusted_confidence = self.reliability_tracker.adjust_confidence(
-                        base_confidence, pattern_stats
-                    )
-
-                    consistency = vm.get("consistency", self._calc_consistency(vm, features))
-
-                    pattern_boost = 0.05 * len(relevant_patterns)
-                    adjusted_confidence = min(1.0, adjusted_confidence + pattern_boost)
-
-                    market_conf = self.market_conf_engine.get_score(
-                        vm["bet_type"], odds_history_dicts
-                    )
-
-                    stake = self.stake_engine.calculate_kelly_stake(
-                        bankroll, vm["odds"], adjusted_confidence
-                    )
-
-                    decision = self.signal_engine.generate_final_decision(
-                        prob_report=probs,
-                        value_edge=vm["edge"],
-                        confidence_score=adjusted_confidence,
-                        stake_amount=stake,
-                        bet_type=vm["bet_type"],
-                        patterns=relevant_patterns,
-                        market_confidence=market_conf,
-                    )
-
-                    if decision["decision"] == "BET":
-                        pattern_names = ",".join(p["name"] for p in relevant_patterns) if relevant_patterns else None
-                        match_signals.append({
-                            "vm": vm,
-                            "decision": decision,
-                            "pattern_names": pattern_names,
-                            "consistency": consistency,
-                        })
-
-                for rank, sig_data in enumerate(match_signals, 1):
-                    vm = sig_data["vm"]
-                    decision = sig_data["decision"]
-
-                    signal = Signal(
-                        match_id=match.id,
-                        market_key=vm.get("market_key", "1x2"),
-                        suggested_bet=decision["bet_type"],
-                        predicted_prob=vm["predicted_prob"],
-                        implied_prob=vm["implied_prob"],
-                        value_edge=decision["edge"],
-                        bookmaker_odds=vm["odds"],
-                        confidence_score=decision["confidence"],
-                        market_confidence=decision["market_confidence"],
-                        recommended_stake=decision["stake"],
-                        consistency_pct=sig_data["consistency"],
-                        rank_in_match=rank,
-                        patterns_detected=sig_data["pattern_names"],
-                        explanation=decision["explanation"],
-                    )
-                    await self.signal_repo.add(signal)
-                    generated_signals.append(signal)
-
-                if match_signals:
-                    match.predicted_home_win_prob = probs["home"]
-                    match.predicted_draw_prob = probs["draw"]
-                    match.predicted_away_win_prob = probs["away"]
-
-                    home_name = match.home_team.name if match.home_team else "?"
-                    away_name = match.away_team.name if match.away_team else "?"
-                    bet_summary = ", ".join(
-                        f"{s['decision']['bet_type']}@{s['vm']['odds']}"
-                        for s in match_signals
-                    )
-                    logger.info(
-                        f"SIGNALS ({len(match_signals)}): {home_name} vs {away_name} | {bet_summary}"
-                    )
+        context = {
+            "standings": [StandingRef(s.team_id, s.position) for s in standings],
+            "bankroll": bankroll,
+            "pattern_stats": {
+                name: {"win_rate": stat.reliability_score, "sample_size": stat.occurrences}
+                for name, stat in pattern_stats.items()
+            },
+        }
 
-            except Exception as e:
-                logger.error(f"Error analyzing match {match.id}: {e}")
-                continue
+        # loader -> compute workers -> persister, joined by bounded queues so a slow
+        # stage holds back the ones before it. The session is shared by the loader and
+        # the persister, so their DB work is serialized by a lock.
+        n_workers = max(1, settings.ANALYSIS_WORKERS)
+        load_queue = asyncio.Queue(maxsize=settings.PIPELINE_QUEUE_SIZE)
+        result_queue = asyncio.Queue(maxsize=settings.PIPELINE_QUEUE_SIZE)
+        self._db_lock = asyncio.Lock()
+        self._force = force
+        self._recomputed_match_ids = []
+        self._pending_match_ids = set()
+        self._fingerprints = {}
+        self._input_versions = self._input_versions_key(standings, pattern_stats)
+        self.stage_stats = {
+            stage: {"chunks": 0, "matches": 0, "busy": 0.0}
+            for stage in ("load", "compute", "persist")
+        }
 
-        await self.session.commit()
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._load_stage(matches, load_queue, n_workers)),
+            *(
+                asyncio.create_task(self._compute_stage(load_queue, result_queue, context))
+                for _ in range(n_workers)
+            ),
+            persister := asyncio.create_task(
+                self._persist_stage(result_queue, {m.id: m for m in matches}, n_workers)
+            ),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        generated_signals = persister.result()
+
+        async with self._db_lock:
+            await self.signal_repo.delete_pending_for_matches(
+                self._recomputed_match_ids, keep_ids=[s.id for s in generated_signals]
+            )
+            await self.session.commit()
+
+        self._log_stage_stats(time.perf_counter() - started)
         logger.info(f"Pipeline complete. {len(generated_signals)} signals generated.")
         return generated_signals
 
-    def _get_relevant_patterns(self, patterns: list, bet_type: str) -> list:
-        relevant = []
-        for p in patterns:
-            supported_markets = p.get("markets", [])
-            if not supported_markets:
-                relevant.append(p)
-            elif bet_type in supported_markets:
-                relevant.append(p)
-        return relevant
-
-    def _diversify_markets(self, value_markets: list, max_picks: int) -> list:
-        selected = []
-        seen_categories = set()
-
-        for vm in value_markets:
-            category = vm.get("market_key", "1x2")
-            if category not in seen_categories:
-                selected.append(vm)
-                seen_categories.add(category)
-                if len(selected) >= max_picks:
-                    break
+    async def _load_stage(self, matches: list, load_queue: asyncio.Queue, n_workers: int):
+        stats = self.stage_stats["load"]
+        size = max(1, settings.ANALYSIS_CHUNK_SIZE)
+        try:
+            for start in range(0, len(matches), size):
+                chunk = matches[start:start + size]
+                t0 = time.perf_counter()
+                async with self._db_lock:
+                    preloaded = await self._preload(chunk)
+                jobs = self._build_jobs(chunk, preloaded)
+                stats["busy"] += time.perf_counter() - t0
+                stats["chunks"] += 1
+                stats["matches"] += len(jobs)
+                if jobs:
+                    await load_queue.put(jobs)
+        finally:
+            for _ in range(n_workers):
+                await load_queue.put(None)
+
+    async def _compute_stage(self, load_queue: asyncio.Queue, result_queue: asyncio.Queue, context: dict):
+        stats = self.stage_stats["compute"]
+        try:
+            while (jobs := await load_queue.get()) is not None:
+                t0 = time.perf_counter()
+                results = await self._compute(jobs, context)
+                stats["busy"] += time.perf_counter() - t0
+                stats["chunks"] += 1
+                stats["matches"] += len(jobs)
+                await result_queue.put(results)
+        finally:
+            await result_queue.put(None)
+
+    async def _persist_stage(self, result_queue: asyncio.Queue, matches_by_id: dict, n_workers: int) -> list[Signal]:
+        stats = self.stage_stats["persist"]
+        generated_signals = []
+        remaining = n_workers
+        while remaining:
+            results = await result_queue.get()
+            if results is None:
+                remaining -= 1
+                continue
 
-        if len(selected) < max_picks:
-            for vm in value_markets:
-                if vm not in selected:
-                    selected.append(vm)
-                    if len(selected) >= max_picks:
-                        break
+            t0 = time.perf_counter()
+            signal_rows = []
+            for result in results:
+                match = matches_by_id[result["match_id"]]
+                match.analysis_fingerprint = self._fingerprints[result["match_id"]]
+                if match.id in self._pending_match_ids:
+                    # Only matches that came back from compute: the upsert replaces
+                    # re-picked signals in place and the rest are dropped at the end.
+                    self._recomputed_match_ids.append(match.id)
+                if not result["signals"]:
+                    continue
+                probs = result["probs"]
+                signal_rows.extend(result["signals"])
+
+                match.predicted_home_win_prob = probs["home"]
+                match.predicted_draw_prob = probs["draw"]
+                match.predicted_away_win_prob = probs["away"]
+
+                home_name = match.home_team.name if match.home_team else "?"
+                away_name = match.away_team.name if match.away_team else "?"
+                bet_summary = ", ".join(
+                    f"{s['suggested_bet']}@{s['bookmaker_odds']}"
+                    for s in result["signals"]
+                )
+                logger.info(
+                    f"SIGNALS ({len(result['signals'])}): {home_name} vs {away_name} | {bet_summary}"
+                )
 
-        return selected
+            async with self._db_lock:
+                generated_signals.extend(await self.signal_repo.add_many(signal_rows))
+            stats["busy"] += time.perf_counter() - t0
+            stats["chunks"] += 1
+            stats["matches"] += len(results)
+        return generated_signals
 
-    def _calc_consistency(self, value_market: dict, features: dict) -> float:
-        if not features:
-            return 0.5
-        bt = value_market["bet_type"]
-        mapping = {
-            "OVER_2.5": "over_25_home_rate",
-            "OVER_1.5": "over_15_home_rate",
-            "OVER_3.5": "over_35_home_rate",
-            "HOME_WIN": "home_form_avg",
-            "AWAY_WIN": "away_form_avg",
+    def _build_jobs(self, matches: list, preloaded: dict) -> list[dict]:
+        jobs = []
+        for match in matches:
+            fingerprint = self._fingerprint(match, preloaded, self._input_versions)
+            if not self._force and match.analysis_fingerprint == fingerprint:
+                continue
+            self._fingerprints[match.id] = fingerprint
+            if preloaded["signals"].get(match.id):
+                self._pending_match_ids.add(match.id)
+
+            jobs.append({
+                "match": MatchRef(match.id, match.home_team_id, match.away_team_id),
+                "home_history": [score_line(m) for m in preloaded["home_history"].get(match.home_team_id, [])],
+                "away_history": [score_line(m) for m in preloaded["away_history"].get(match.away_team_id, [])],
+                "odds": self._odds_dict(preloaded["latest_odds"].get(match.id)),
+                "odds_history": [
+                    {"home_odds": o.home_odds, "away_odds": o.away_odds}
+                    for o in preloaded["odds_history"].get(match.id, [])
+                ],
+            })
+        return jobs
+
+    @staticmethod
+    def _input_versions_key(standings: list, pattern_stats: dict) -> str:
+        # Values, not snapshot dates: re-fetching an identical table must not
+        # invalidate the slate.
+        table = ",".join(f"{team_id}:{position}" for team_id, position in sorted(
+            (s.team_id, s.position) for s in standings
+        ))
+        patterns = ",".join(
+            f"{name}:{stat.occurrences}:{stat.wins}" for name, stat in sorted(pattern_stats.items())
+        )
+        return f"{model_signature()}|{table}|{patterns}"
+
+    @classmethod
+    def _fingerprint(cls, match, preloaded: dict, input_versions: str) -> str:
+        # Everything a match's analysis reads: history rows, the current prices, the
+        # opening 1X2 prices and snapshot count the market-confidence score uses, the
+        # standings table, pattern stats and the model/settings signature. Odds are
+        # hashed by value because every cycle stores a new snapshot.
+        odds_history = preloaded["odds_history"].get(match.id, [])
+        opening = odds_history[0] if odds_history else None
+        parts = (
+            input_versions,
+            ",".join(str(m.id) for m in preloaded["home_history"].get(match.home_team_id, [])),
+            ",".join(str(m.id) for m in preloaded["away_history"].get(match.away_team_id, [])),
+            repr(sorted(cls._odds_dict(preloaded["latest_odds"].get(match.id)).items())),
+            repr((opening.home_odds, opening.away_odds) if opening else None),
+            # The stability bonus stops growing at five snapshots.
+            str(min(len(odds_history), 5)),
+        )
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    async def _compute(self, jobs: list[dict], context: dict) -> list[dict]:
+        executor = get_executor()
+        if executor is None:
+            # In-process, but off the event loop so the bot keeps polling.
+            return await asyncio.to_thread(analyze_chunk, jobs, context)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, analyze_chunk, jobs, context)
+
+    def _log_stage_stats(self, elapsed: float):
+        parts = []
+        for stage, stats in self.stage_stats.items():
+            rate = stats["matches"] / stats["busy"] if stats["busy"] else 0.0
+            parts.append(f"{stage} {stats['matches']} in {stats['busy']:.3f}s ({rate:.0f}/s)")
+        logger.info(f"Pipeline stages: {', '.join(parts)}; wall {elapsed:.3f}s")
+
+    async def _preload(self, matches: list) -> dict:
+        # Everything a chunk of matches needs, fetched in a fixed number of set-based queries.
+        match_ids = [m.id for m in matches]
+        return {
+            "signals": await self.signal_repo.get_by_match_ids(match_ids),
+            "home_history": await self.match_repo.get_home_matches_for_teams(m.home_team_id for m in matches),
+            "away_history": await self.match_repo.get_away_matches_for_teams(m.away_team_id for m in matches),
+            "latest_odds": await self.odds_repo.get_latest_for_matches(match_ids),
+            "odds_history": await self.odds_repo.get_all_for_matches(match_ids),
         }
-        key = mapping.get(bt)
-        if key and key in features:
-            return features[key]
-        if bt.startswith("UNDER_"):
-            over_bt = bt.replace("UNDER_", "OVER_")
-            over_key = mapping.get(over_bt)
-            if over_key and over_key in features:
-                return 1.0 - features[over_key]
-        return value_market.get("predicted_prob", 0.5)
+
+    @staticmethod
+    def _odds_dict(odds) -> dict:
+        if not odds:
+            return {}
+        return {key: getattr(odds, key) for key in market_registry.ODDS_KEYS if key}
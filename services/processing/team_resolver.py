@@ -0,0 +1,97 @@
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from data.repositories.team_repo import TeamRepository
+from data.repositories.team_alias_repo import TeamAliasRepository
+from utils.team_names import normalize_team_name, name_tokens, token_key
+
+logger = logging.getLogger(__name__)
+
+
+class TeamResolver:
+    # Maps bookmaker team names to team ids. Canonical names, token keys and every
+    # stored alias sit in one dict, so a known spelling is a single lookup. A new
+    # spelling with the same tokens as a team is stored as an alias. Otherwise the
+    # token index may still pick a unique team whose names contain every token of
+    # the spelling; that guess is used for this run only and never stored. Names
+    # that stay ambiguous or unknown are recorded with a NULL team for an admin to map.
+    def __init__(self, session: AsyncSession):
+        self.team_repo = TeamRepository(session)
+        self.alias_repo = TeamAliasRepository(session)
+        self._index = {}
+        self._tokens = {}
+        self._pending = {}
+
+    async def load(self):
+        ambiguous = set()
+        for team in await self.team_repo.get_all():
+            for name in filter(None, (team.name, team.short_name, team.tla)):
+                for key in (normalize_team_name(name), token_key(name)):
+                    if self._index.get(key, team.id) != team.id:
+                        ambiguous.add(key)
+                    self._index[key] = team.id
+            for name in filter(None, (team.name, team.short_name)):
+                for token in name_tokens(name):
+                    self._tokens.setdefault(token, set()).add(team.id)
+        for key in ambiguous:
+            del self._index[key]
+
+        for alias in await self.alias_repo.get_all():
+            if alias.team_id is not None:
+                self._index[alias.alias] = alias.team_id
+
+    def resolve(self, name: str) -> int | None:
+        key = normalize_team_name(name)
+        if key in self._index:
+            team_id = self._index[key]
+            if team_id is None:
+                self._record(key, name, None)
+            return team_id
+
+        team_id = self._index.get(token_key(name))
+        if team_id is None:
+            guess = self._by_tokens(name)
+            if guess is not None:
+                self._index[key] = guess
+                return guess
+        self._index[key] = team_id
+        self._record(key, name, team_id)
+        if team_id is None:
+            logger.debug(f"Unresolved team name: {name}")
+        return team_id
+
+    def _by_tokens(self, name: str) -> int | None:
+        # Every token must belong to the team: "Newcastle Jets" is not Newcastle.
+        candidates = None
+        for token in name_tokens(name):
+            teams = self._tokens.get(token)
+            if teams is None:
+                return None
+            candidates = teams if candidates is None else candidates & teams
+        if candidates and len(candidates) == 1:
+            return next(iter(candidates))
+        return None
+
+    def _record(self, key: str, name: str, team_id: int | None):
+        row = self._pending.get(key)
+        if row:
+            row["seen_count"] += 1
+            return
+        self._pending[key] = {
+            "alias": key,
+            "raw_name": name,
+            "team_id": team_id,
+            "source": "auto" if team_id else "unresolved",
+            "seen_count": 1,
+            "last_seen": datetime.utcnow(),
+        }
+
+    @property
+    def unresolved(self) -> list[str]:
+        return [row["raw_name"] for row in self._pending.values() if row["team_id"] is None]
+
+    async def save(self):
+        await self.alias_repo.record_many(list(self._pending.values()))
+        if self.unresolved:
+            logger.warning(f"Unresolved bookmaker team names: {', '.join(self.unresolved)}")
+        self._pending.clear()
@@ -1,17 +1,20 @@
 import asyncio
 import logging
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from data.database import AsyncSessionLocal
 from services.data_fetch.football_data_service import FootballDataService
 from services.data_fetch.odds_service import OddsService
 from services.data_fetch.standings_service import StandingsService
 from services.processing.match_preprocessor import MatchPreprocessor
+from services.processing.match_sync_service import MatchSyncService
+from services.processing.team_resolver import TeamResolver
 from services.processing.signal_pipeline_service import SignalPipelineService
-from services.learning.performance_update_service import PerformanceUpdateService
+from services.learning.settlement_service import SettlementService
 from data.repositories.match_repo import MatchRepository
-from data.repositories.team_repo import TeamRepository
 from data.repositories.odds_repo import OddsRepository
 from data.repositories.bankroll_repo import BankrollRepository
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +27,23 @@ class DailyRunner:
 
     async def run_daily_cycle(self) -> dict:
         logger.info("Starting Daily Intelligence Cycle...")
-        stats = {"teams": 0, "matches": 0, "odds": 0, "standings": 0, "signals": 0}
+        stats = {"teams": 0, "matches": 0, "odds": 0, "standings": 0, "settled": 0, "analyzed": 0, "signals": 0}
+
+        payloads = await self._fetch_all()
+        stats["failed_fetches"] = [name for name, data in payloads.items() if data is None]
 
         async with AsyncSessionLocal() as session:
             try:
-                stats["teams"], stats["matches"] = await self._fetch_matches(session)
-                stats["standings"] = await self._fetch_standings(session)
-                stats["odds"] = await self._fetch_odds(session)
-                await self._update_results(session)
+                # Dependency order: standings resolve teams and odds resolve matches.
+                stats["teams"], stats["matches"] = await self._store_matches(session, payloads["matches"])
+                stats["standings"] = await self._store_standings(session, payloads["standings"])
+                stats["odds"] = await self._store_odds(session, payloads["odds"])
+                stats["settled"] = await self._update_results(session)
 
                 standings_service = StandingsService(session, self.football_service)
                 pipeline = SignalPipelineService(session, standings_service)
                 signals = await pipeline.execute_full_analysis()
+                stats["analyzed"] = pipeline.stage_stats["compute"]["matches"]
                 stats["signals"] = len(signals)
 
                 await session.commit()
@@ -46,98 +54,50 @@ class DailyRunner:
         logger.info(f"Daily Cycle Complete: {stats}")
         return stats
 
-    async def _fetch_matches(self, session: AsyncSession) -> tuple[int, int]:
-        data = await self.football_service.fetch_epl_matches()
+    async def _fetch_all(self) -> dict:
+        # Network phase: the providers are independent, so all fetches run at once.
+        # A stage that fails or times out yields None and the rest still get stored.
+        stages = {
+            "matches": (self.football_service.fetch_epl_matches, settings.MATCHES_FETCH_TIMEOUT),
+            "standings": (self.football_service.fetch_epl_standings, settings.STANDINGS_FETCH_TIMEOUT),
+            "odds": (self.odds_service.fetch_latest_odds, settings.ODDS_FETCH_TIMEOUT),
+        }
+        results = await asyncio.gather(*(
+            self._fetch_stage(name, fetch, timeout) for name, (fetch, timeout) in stages.items()
+        ))
+        return dict(zip(stages, results))
+
+    async def _fetch_stage(self, name: str, fetch, timeout: float):
+        start = time.perf_counter()
+        try:
+            data = await asyncio.wait_for(fetch(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Fetching {name} timed out after {timeout}s")
+            return None
+        except Exception as e:
+            logger.error(f"Fetching {name} failed: {e}")
+            return None
+        logger.info(f"Fetched {name} in {time.perf_counter() - start:.2f}s")
+        return data
+
+    async def _store_matches(self, session: AsyncSession, data: dict | None) -> tuple[int, int]:
         if not data:
             return 0, 0
+        stats = await MatchSyncService(session).sync(data.get("matches", []))
+        return stats["teams"], stats["matches"]
 
-        team_repo = TeamRepository(session)
-        match_repo = MatchRepository(session)
-
-        matches_raw = data.get("matches", [])
-        teams_saved = set()
-        match_count = 0
-
-        for api_match in matches_raw:
-            for side in ["homeTeam", "awayTeam"]:
-                team_data = api_match.get(side, {})
-                ext_id = team_data.get("id")
-                if ext_id and ext_id not in teams_saved:
-                    await team_repo.upsert({
-                        "external_id": ext_id,
-                        "name": team_data.get("name", "Unknown"),
-                        "short_name": team_data.get("shortName", ""),
-                        "tla": team_data.get("tla", ""),
-                    })
-                    teams_saved.add(ext_id)
-
-            normalized = self.preprocessor.normalize_match_data(api_match)
-
-            home_team = await team_repo.get_by_external_id(normalized["home_team_external_id"])
-            away_team = await team_repo.get_by_external_id(normalized["away_team_external_id"])
-
-            if home_team and away_team:
-                await match_repo.upsert({
-                    "external_id": normalized["external_id"],
-                    "utc_date": normalized["utc_date"],
-                    "status": normalized["status"],
-                    "matchday": normalized.get("matchday"),
-                    "home_team_id": home_team.id,
-                    "away_team_id": away_team.id,
-                    "home_score": normalized["home_score"],
-                    "away_score": normalized["away_score"],
-                    "home_ht_score": normalized.get("home_ht_score"),
-                    "away_ht_score": normalized.get("away_ht_score"),
-                })
-                match_count += 1
-
-        await session.flush()
-        logger.info(f"Fetched {len(teams_saved)} teams, {match_count} matches")
-        return len(teams_saved), match_count
-
-    async def _fetch_standings(self, session: AsyncSession) -> int:
+    async def _store_standings(self, session: AsyncSession, data: dict | None) -> int:
         standings_service = StandingsService(session, self.football_service)
-        return await standings_service.update_standings()
-
-    @staticmethod
-    def _normalize_team_name(name: str) -> str:
-        n = name.lower().strip()
-        for suffix in [" fc", " afc"]:
-            if n.endswith(suffix):
-                n = n[:-len(suffix)].strip()
-        if n.startswith("afc "):
-            n = n[4:].strip()
-        n = n.replace("&", "and")
-        n = n.replace("  ", " ")
-        return n
+        return await standings_service.store_standings(data)
 
-    async def _build_team_lookup(self, session: AsyncSession) -> dict:
-        team_repo = TeamRepository(session)
-        teams = await team_repo.get_all()
-        lookup = {}
-        for t in teams:
-            lookup[self._normalize_team_name(t.name)] = t.id
-            if t.short_name:
-                lookup[self._normalize_team_name(t.short_name)] = t.id
-        return lookup
-
-    def _find_team_id(self, name: str, lookup: dict) -> int | None:
-        normalized = self._normalize_team_name(name)
-        if normalized in lookup:
-            return lookup[normalized]
-        for key, tid in lookup.items():
-            if normalized in key or key in normalized:
-                return tid
-        return None
-
-    async def _fetch_odds(self, session: AsyncSession) -> int:
-        raw_odds = await self.odds_service.fetch_latest_odds()
+    async def _store_odds(self, session: AsyncSession, raw_odds: list | None) -> int:
         if not raw_odds:
             return 0
 
         odds_repo = OddsRepository(session)
         match_repo = MatchRepository(session)
-        team_lookup = await self._build_team_lookup(session)
+        resolver = TeamResolver(session)
+        await resolver.load()
         upcoming = await match_repo.get_upcoming()
 
         match_lookup = {}
@@ -151,8 +111,8 @@ class DailyRunner:
             home_team_name = game.get("home_team", "")
             away_team_name = game.get("away_team", "")
 
-            home_id = self._find_team_id(home_team_name, team_lookup)
-            away_id = self._find_team_id(away_team_name, team_lookup)
+            home_id = resolver.resolve(home_team_name)
+            away_id = resolver.resolve(away_team_name)
 
             if not home_id or not away_id:
                 logger.debug(f"Could not match teams: {home_team_name} vs {away_team_name}")
@@ -204,72 +164,10 @@ class DailyRunner:
                 await odds_repo.add_snapshot(normalized)
                 count += 1
 
+        await resolver.save()
         await session.flush()
         logger.info(f"Processed {count} odds snapshots")
         return count
 
-    async def _update_results(self, session: AsyncSession):
-        perf_service = PerformanceUpdateService(session)
-
-        from sqlalchemy import select
-        from data.models.match import Match
-        from data.models.signal import Signal
-
-        result = await session.execute(
-            select(Match).join(Signal).where(
-                Match.status == "FINISHED",
-                Signal.result_won == None,
-            )
-        )
-        finished_with_pending = list(result.unique().scalars().all())
-
-        for match in finished_with_pending:
-            if match.home_score is None or match.away_score is None:
-                continue
-
-            total_goals = match.home_score + match.away_score
-            ht_total = None
-            if match.home_ht_score is not None and match.away_ht_score is not None:
-                ht_total = match.home_ht_score + match.away_ht_score
-
-            outcomes = {
-                "HOME_WIN": match.home_score > match.away_score,
-                "DRAW": match.home_score == match.away_score,
-                "AWAY_WIN": match.away_score > match.home_score,
-                "OVER_0.5": total_goals > 0,
-                "OVER_1.5": total_goals > 1,
-                "OVER_2.5": total_goals > 2,
-                "OVER_3.5": total_goals > 3,
-                "UNDER_1.5": total_goals < 2,
-                "UNDER_2.5": total_goals < 3,
-                "UNDER_3.5": total_goals < 4,
-                "BTTS_YES": match.home_score > 0 and match.away_score > 0,
-                "BTTS_NO": match.home_score == 0 or match.away_score == 0,
-                "CLEAN_SHEET_HOME": match.away_score == 0,
-                "CLEAN_SHEET_AWAY": match.home_score == 0,
-                "ODD_GOALS": total_goals % 2 == 1,
-                "EVEN_GOALS": total_goals % 2 == 0,
-            }
-
-            if ht_total is not None:
-                outcomes["HT_HOME"] = match.home_ht_score > match.away_ht_score
-                outcomes["HT_DRAW"] = match.home_ht_score == match.away_ht_score
-                outcomes["HT_AWAY"] = match.away_ht_score > match.home_ht_score
-                outcomes["HT_OVER_0.5"] = ht_total > 0
-                second_half_goals = total_goals - ht_total
-                outcomes["LATE_GOAL"] = second_half_goals >= 2
-
-            sig_result = await session.execute(
-                select(Signal).where(
-                    Signal.match_id == match.id,
-                    Signal.result_won == None,
-                )
-            )
-            pending_signals = list(sig_result.scalars().all())
-
-            for sig in pending_signals:
-                won = outcomes.get(sig.suggested_bet)
-                if won is not None:
-                    sig.result_won = won
-
-            await perf_service.process_match_result(match.id, "HOME_WIN" if match.home_score > match.away_score else ("AWAY_WIN" if match.away_score > match.home_score else "DRAW"))
+    async def _update_results(self, session: AsyncSession) -> int:
+        return await SettlementService(session).settle_pending()
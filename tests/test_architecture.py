@@ -38,6 +38,18 @@ def test_core_is_pure_brain():
     print("PASS: Core layer is pure math - no DB/API/UI imports")
 
 
+def test_utils_are_leaf_helpers():
+    violations = []
+    for filename in os.listdir("utils"):
+        if not filename.endswith(".py") or filename == "__init__.py":
+            continue
+        for imp in get_imports(os.path.join("utils", filename)):
+            if any(imp == prefix or imp.startswith(prefix + ".") for prefix in ["core", "data", "bot", "services"]):
+                violations.append(f"{filename} imports {imp}")
+    assert not violations, f"Utils must not depend on app layers: {violations}"
+    print("PASS: Utils are leaf helpers - no core/data/bot/services imports")
+
+
 def test_bot_has_no_core_math():
     bot_dir = "bot"
     violations = []
@@ -191,9 +203,1282 @@ def test_idempotent_upsert():
     asyncio.run(_test())
 
 
+def test_probability_engine_batch():
+    from core.probability_engine import ProbabilityEngine
+
+    engine = ProbabilityEngine()
+    features_list = [
+        {"home_form_avg": 0.6, "away_form_avg": 0.3, "position_gap": 5},
+        {"home_scored_avg": 3.2, "away_conceded_avg": 2.4, "position_gap": 15},
+        {"away_scored_avg": 2.1, "home_conceded_avg": 1.8, "position_gap": -12},
+        {},
+    ]
+    batch = engine.calculate_probs_batch(features_list)
+    assert len(batch) == len(features_list)
+    for features, report in zip(features_list, batch):
+        single = engine.calculate_probs(features)
+        assert report.keys() == single.keys()
+        for key in single:
+            assert abs(report[key] - single[key]) <= 1e-4 + 1e-9, f"{key}: {report[key]} != {single[key]}"
+    assert engine.calculate_probs_batch([]) == []
+    print(f"PASS: Batched probability engine matches scalar path for {len(batch)} matches")
+
+
+def test_score_distribution_markets():
+    from core.probability_engine import ProbabilityEngine
+    from core.score_distribution import ScoreDistribution
+
+    engine = ProbabilityEngine()
+    dist = ScoreDistribution.from_grids(engine._poisson_grid(1.8, 0.9))
+
+    assert abs(dist.cells.sum() - 1.0) < 1e-9
+    assert abs(dist.asian_handicap(-0.5)["win"][0] - dist.home_win()[0]) < 1e-9
+    assert abs(dist.asian_handicap(0)["push"][0] - dist.draw()[0]) < 1e-9
+    quarter = dist.asian_handicap(-0.25)
+    assert abs(quarter["push"][0] - dist.draw()[0] / 2) < 1e-9
+    assert abs(sum(quarter[k][0] for k in ("win", "push", "lose")) - 1.0) < 1e-9
+
+    margins = sum(dist.winning_margin(m)[0] for m in range(1, dist.max_goals + 1))
+    assert abs(margins - dist.home_win()[0]) < 1e-9
+    assert abs(dist.winning_margin(2, or_more=True)[0] - (dist.home_win()[0] - dist.winning_margin(1)[0])) < 1e-9
+    assert abs(dist.team_total_over("away", 0.5)[0] - (1.0 - dist.clean_sheet_home()[0])) < 1e-9
+    assert abs(dist.over(2.5)[0] + dist.under(2.5)[0] - 1.0) < 1e-9
+    assert dist.correct_score(9, 9)[0] == 0.0
+    print("PASS: Score distribution derives niche markets from shared accumulators")
+
+
+def test_poisson_pmf_cache():
+    from core.poisson_cache import PoissonPMFCache, poisson_pmf_matrix
+
+    cache = PoissonPMFCache(step=0.005, max_entries=1000, max_goals=7)
+    first = cache.get_many([1.2, 1.2012, 0.75])
+    assert cache.cache_info()["misses"] == 3
+    second = cache.get_many([1.2, 0.75])
+    assert cache.cache_info()["hits"] == 2
+    assert (second[0] == first[0]).all()
+
+    exact = poisson_pmf_matrix([1.2, 1.2, 0.75], 7)
+    assert abs(first - exact).max() < 1e-12
+
+    beyond = cache.get(12.0)
+    assert abs(beyond - poisson_pmf_matrix([12.0], 7)[0]).max() < 1e-12
+    assert cache.cache_info()["size"] == 2
+    print(f"PASS: PMF cache {cache.cache_info()}")
+
+
+def test_adaptive_grid_truncation():
+    from core.probability_engine import ProbabilityEngine
+
+    engine = ProbabilityEngine(pmf_step=0, tail_tolerance=1e-6)
+    lopsided_features = {"home_scored_avg": 3.0, "away_conceded_avg": 2.0, "position_gap": 18, "home_form_avg": 1.0}
+    typical = engine.calculate_probs_batch([{}], diagnostics=True)[0]
+    lopsided = engine.calculate_probs_batch([lopsided_features], diagnostics=True)[0]
+
+    # A lopsided fixture in the same slate does not resize its neighbours' grids.
+    for fast_mode in (False, True):
+        mixed_engine = ProbabilityEngine(pmf_step=0, tail_tolerance=1e-6, fast_mode=fast_mode)
+        alone = mixed_engine.calculate_probs_batch([{}], diagnostics=True)[0]
+        mixed = mixed_engine.calculate_probs_batch([{}, lopsided_features], diagnostics=True)
+        assert mixed[0]["ft_grid_goals"] == alone["ft_grid_goals"] < mixed[1]["ft_grid_goals"]
+        for key, value in alone.items():
+            assert abs(mixed[0][key] - value) < 1e-12, (key, mixed[0][key], value)
+
+    assert typical["ft_truncated_mass"] < 2e-6
+    assert lopsided["ft_grid_goals"] > typical["ft_grid_goals"]
+    assert lopsided["ft_truncated_mass"] < 2e-6
+
+    legacy = ProbabilityEngine(pmf_step=0, tail_tolerance=None).calculate_probs_batch([{}], diagnostics=True)[0]
+    assert legacy["ft_grid_goals"] == 7 and legacy["ht_grid_goals"] == 5
+    print(f"PASS: Adaptive grid sized {typical['ft_grid_goals']} (typical) vs {lopsided['ft_grid_goals']} (lopsided)")
+
+
+def test_closed_form_fast_path():
+    from core.probability_engine import ProbabilityEngine
+
+    features_list = [
+        {"home_form_avg": 0.6, "away_form_avg": 0.3, "position_gap": 5},
+        {"home_scored_avg": 2.2, "away_conceded_avg": 1.9, "position_gap": 9},
+        {"away_scored_avg": 1.8, "home_conceded_avg": 1.6, "position_gap": -7},
+    ]
+    grid = ProbabilityEngine(pmf_step=0).calculate_probs_batch(features_list)
+    fast = ProbabilityEngine(pmf_step=0, fast_mode=True).calculate_probs_batch(features_list)
+    headline = ProbabilityEngine(pmf_step=0).calculate_headline_probs_batch(features_list)
+
+    for g, f, h in zip(grid, fast, headline):
+        assert list(g) == list(f)
+        for key in g:
+            assert abs(g[key] - f[key]) <= 1e-4 + 1e-9, f"{key}: {g[key]} != {f[key]}"
+        assert abs(h["home"] + h["draw"] + h["away"] - 1.0) < 1e-3
+        assert abs(h["over_45"] + h["under_45"] - 1.0) < 1e-3
+        assert abs(h["over_25"] - g["over_25"]) <= 1e-4 + 1e-9
+        assert "btts_yes" not in h
+    print("PASS: Closed-form headline markets match the Poisson grid")
+
+
+def test_score_table_lookup():
+    import tempfile
+    from core.probability_engine import ProbabilityEngine
+    from core.score_table import ScoreTable, build_score_table, check_accuracy
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_score_table(os.path.join(tmp, "grid.npy"), xg_min=0.1, xg_max=3.0, step=0.02, max_goals=9)
+        table = ScoreTable.open(path)
+        assert table.max_goals == 9
+
+        accuracy = check_accuracy(table, samples=200)
+        assert accuracy["max_market_error"] < 1e-3, accuracy
+
+        features = {"home_form_avg": 0.6, "away_form_avg": 0.3, "position_gap": 5}
+        exact = ProbabilityEngine(pmf_step=0).calculate_probs(features)
+        looked_up = ProbabilityEngine(pmf_step=0, score_table=table).calculate_probs(features)
+        for key in ("home", "draw", "away", "over_25", "btts_yes", "ht_home"):
+            assert abs(exact[key] - looked_up[key]) < 1e-3, key
+        del table
+    print(f"PASS: Memory-mapped score table within {accuracy['max_market_error']:.1e} of exact grids")
+
+
+def test_market_registry():
+    import numpy as np
+    from core import market_registry
+    from core.probability_engine import ProbabilityEngine
+    from utils.formatters import MARKET_LABELS
+
+    assert set(MARKET_LABELS) == set(market_registry.BET_TYPES)
+    assert market_registry.BET_TYPES[market_registry.market_id("UNDER_2.5")] == "UNDER_2.5"
+
+    probs = ProbabilityEngine().calculate_probs({"home_form_avg": 0.6, "away_form_avg": 0.3, "position_gap": 5})
+    vec = market_registry.prob_vector(probs)
+    assert abs(vec[market_registry.market_id("UNDER_2.5")] - (1 - probs["over_25"])) < 1e-12
+    assert np.isnan(market_registry.prob_vector({"home": 0.5})[market_registry.market_id("DRAW")])
+
+    odds = market_registry.odds_vector({"home_odds": 2.1, "draw_odds": 1.0, "away_odds": None})
+    assert odds[market_registry.market_id("HOME_WIN")] == 2.1
+    assert np.isnan(odds[market_registry.market_id("DRAW")]) and np.isnan(odds[market_registry.market_id("AWAY_WIN")])
+
+    outcomes = market_registry.settle_all(2, 1, 0, 0)
+    assert outcomes["HOME_WIN"] and outcomes["OVER_2.5"] and outcomes["BTTS_YES"] and outcomes["LATE_GOAL"]
+    assert not outcomes["HT_HOME"] and outcomes["HT_DRAW"]
+    assert "HT_HOME" not in market_registry.settle_all(2, 1)
+    assert market_registry.settle("HT_HOME", 2, 1) is None
+
+    features = {"over_25_home_rate": 0.7, "odd_goals_rate": 0.4}
+    assert abs(market_registry.consistency("UNDER_2.5", features) - 0.3) < 1e-12
+    assert abs(market_registry.consistency("EVEN_GOALS", features) - 0.6) < 1e-12
+    assert market_registry.consistency("DRAW", features) == 0.5
+    print(f"PASS: Market registry compiles {market_registry.MARKET_COUNT} markets")
+
+
+def test_value_detector_batch():
+    import numpy as np
+    from core import market_registry
+    from core.probability_engine import ProbabilityEngine
+    from core.value_detector import ValueDetector
+
+    detector = ValueDetector(min_edge=0.03)
+    features_list = [
+        {"home_form_avg": 0.8, "away_form_avg": 0.2, "position_gap": 10, "over_25_home_rate": 0.6},
+        {"home_form_avg": 0.3, "away_form_avg": 0.7, "position_gap": -6},
+        {"home_form_avg": 0.5, "away_form_avg": 0.5, "position_gap": 0},
+    ]
+    probs_list = ProbabilityEngine().calculate_probs_batch(features_list)
+    odds_list = [
+        {"home_odds": 2.5, "draw_odds": 3.4, "away_odds": 3.1, "over_25_odds": 2.2, "under_25_odds": 1.7},
+        {"home_odds": 1.9, "draw_odds": None, "away_odds": 2.8},
+        {},
+    ]
+
+    batched = detector.evaluate_all_markets_batch(probs_list, odds_list, features_list)
+    for probs, odds, features, markets in zip(probs_list, odds_list, features_list, batched):
+        assert markets == detector.evaluate_all_markets(probs, odds, features)
+
+    evaluation = detector.evaluate_batch(
+        market_registry.prob_matrix(probs_list), market_registry.odds_matrix(odds_list)
+    )
+    assert evaluation["edges"].shape == (3, market_registry.MARKET_COUNT)
+    assert not evaluation["has_bookmaker_odds"][1, market_registry.market_id("DRAW")]
+    top = detector.top_markets(evaluation, k=2)
+    assert top.shape == (3, 2)
+    for row, markets in enumerate(batched):
+        expected = [market_registry.market_id(m["bet_type"]) for m in markets[:2]]
+        assert top[row][:len(expected)].tolist() == expected
+    print(f"PASS: Batched value detection matches per-match evaluation ({sum(map(len, batched))} markets)")
+
+
+def test_devig_methods():
+    import numpy as np
+    from core.devig import devig, overround
+    from core.value_detector import ValueDetector
+    from utils.odds import remove_margin
+
+    odds = np.array([[2.10, 3.40, 3.60], [1.50, 4.20, 7.00], [2.00, np.nan, 3.50]])
+    for method in ("proportional", "power", "shin"):
+        fair = devig(odds, method)
+        assert np.allclose(fair[:2].sum(axis=1), 1.0), method
+        assert np.isnan(fair[2]).all(), method
+        assert (fair[:2] < 1.0 / odds[:2]).all(), method
+        totals = devig([[1.85, 1.95], [2.40, 1.55]], method)
+        assert np.allclose(totals.sum(axis=1), 1.0), method
+
+    assert np.allclose(devig(odds[:1], "proportional")[0], remove_margin(2.10, 3.40, 3.60))
+    shin = devig(odds[1:2], "shin")[0]
+    proportional = devig(odds[1:2], "proportional")[0]
+    assert shin[0] > proportional[0] and shin[2] < proportional[2]
+    assert overround(odds[:1])[0] > 0
+
+    probs = {"home": 0.55, "draw": 0.25, "away": 0.20}
+    book = {"home_odds": 2.10, "draw_odds": 3.40, "away_odds": 3.60}
+    raw = ValueDetector(min_edge=0.0).evaluate_all_markets(probs, book)
+    fair = ValueDetector(min_edge=0.0, devig_method="shin").evaluate_all_markets(probs, book)
+    assert raw[0]["bet_type"] == fair[0]["bet_type"] == "HOME_WIN"
+    assert fair[0]["implied_prob"] < raw[0]["implied_prob"] and fair[0]["edge"] > raw[0]["edge"]
+    print("PASS: Proportional, power and Shin devig on 1X2 and two-way books")
+
+
+async def _memory_db():
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from data.database import Base
+    import data.models.team, data.models.match, data.models.odds, data.models.signal  # noqa: F401
+    import data.models.bankroll, data.models.pattern_stat, data.models.standing_snapshot  # noqa: F401
+    import data.models.team_alias, data.models.current_standing  # noqa: F401
+
+    memory_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with memory_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return memory_engine, async_sessionmaker(bind=memory_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _seed_slate(session, n_matches: int, history: int = 6):
+    import random
+    from datetime import datetime, timedelta
+    from data.models.team import Team
+    from data.models.match import Match
+    from data.models.odds import Odds
+
+    rng = random.Random(n_matches)
+    teams = [Team(external_id=1000 + i, name=f"Team {i}") for i in range(2 * n_matches)]
+    session.add_all(teams)
+    await session.flush()
+
+    now = datetime.utcnow()
+    ext_id = 5000
+    for t, team in enumerate(teams):
+        opponent = teams[(t + 1) % len(teams)]
+        for k in range(history):
+            ext_id += 1
+            home, away = (team, opponent) if k % 2 == 0 else (opponent, team)
+            session.add(Match(
+                external_id=ext_id, utc_date=now - timedelta(days=7 * k + t), status="FINISHED",
+                home_team_id=home.id, away_team_id=away.id,
+                home_score=rng.randint(0, 4), away_score=rng.randint(0, 3),
+                home_ht_score=0, away_ht_score=0,
+            ))
+
+    upcoming = []
+    for i in range(n_matches):
+        ext_id += 1
+        match = Match(
+            external_id=ext_id, utc_date=now + timedelta(days=1, hours=i), status="SCHEDULED",
+            home_team_id=teams[2 * i].id, away_team_id=teams[2 * i + 1].id,
+        )
+        session.add(match)
+        upcoming.append(match)
+    await session.flush()
+
+    for i, match in enumerate(upcoming):
+        for h in range(2):
+            session.add(Odds(
+                match_id=match.id, recorded_at=now - timedelta(hours=2 - h),
+                home_odds=round(rng.uniform(1.6, 4.5), 2), draw_odds=round(rng.uniform(3.0, 4.2), 2),
+                away_odds=round(rng.uniform(1.8, 6.0), 2),
+                over_25_odds=round(rng.uniform(1.6, 2.6), 2), under_25_odds=round(rng.uniform(1.5, 2.4), 2),
+            ))
+    await session.commit()
+    return upcoming
+
+
+def test_pipeline_preload_query_count():
+    async def _test():
+        from sqlalchemy import event
+        from data.repositories.match_repo import MatchRepository
+        from data.repositories.odds_repo import OddsRepository
+        from services.data_fetch.standings_service import StandingsService
+        from services.processing.signal_pipeline_service import SignalPipelineService
+
+        statement_counts = []
+        for n_matches in (3, 9):
+            memory_engine, session_factory = await _memory_db()
+            statements = []
+            event.listen(
+                memory_engine.sync_engine, "before_cursor_execute",
+                lambda conn, cursor, statement, *args: statements.append(statement),
+            )
+            async with session_factory() as session:
+                upcoming = await _seed_slate(session, n_matches)
+
+                match_repo = MatchRepository(session)
+                odds_repo = OddsRepository(session)
+                home = await match_repo.get_home_matches_for_teams(m.home_team_id for m in upcoming)
+                latest = await odds_repo.get_latest_for_matches(m.id for m in upcoming)
+                for m in upcoming:
+                    expected = await match_repo.get_home_matches(m.home_team_id)
+                    assert [x.id for x in home[m.home_team_id]] == [x.id for x in expected]
+                    assert latest[m.id].id == (await odds_repo.get_latest_for_match(m.id)).id
+
+                statements.clear()
+                pipeline = SignalPipelineService(session, StandingsService(session, None))
+                await pipeline.execute_full_analysis()
+                statement_counts.append(len(statements))
+            await memory_engine.dispose()
+
+        assert statement_counts[0] == statement_counts[1], statement_counts
+        print(f"PASS: Pipeline issues {statement_counts[0]} statements regardless of slate size")
+
+    asyncio.run(_test())
+
+
+def test_signal_bulk_upsert():
+    async def _test():
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from data.migrations import signal_unique_index
+        from data.repositories.signal_repo import SignalRepository
+
+        memory_engine, session_factory = await _memory_db()
+        async with session_factory() as session:
+            upcoming = await _seed_slate(session, 2)
+            repo = SignalRepository(session)
+            rows = [
+                {"match_id": m.id, "suggested_bet": bet, "value_edge": 0.05, "bookmaker_odds": 2.0,
+                 "confidence_score": 0.6, "recommended_stake": 10.0, "rank_in_match": rank}
+                for m in upcoming for rank, bet in enumerate(("HOME_WIN", "OVER_2.5"), 1)
+            ]
+            first = await repo.add_many(rows)
+            assert len(first) == 4 and all(s.id for s in first)
+            first[0].result_won = True
+            await session.commit()
+
+            for row in rows:
+                row["value_edge"] = 0.09
+            second = await repo.add_many(rows, chunk_size=3)
+            await session.commit()
+            assert len(second) == 3
+            assert {s.id for s in second} == {s.id for s in first[1:]}
+            assert all(s.value_edge == 0.09 for s in second)
+
+            stored = await repo.get_by_match_ids([m.id for m in upcoming])
+            assert sum(len(v) for v in stored.values()) == 4
+            assert stored[first[0].match_id][0].value_edge == 0.05
+        await memory_engine.dispose()
+
+        legacy_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with legacy_engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE signals (id INTEGER PRIMARY KEY, match_id INTEGER, suggested_bet TEXT, result_won BOOLEAN)"
+            ))
+            await conn.execute(text(
+                "INSERT INTO signals (id, match_id, suggested_bet, result_won) VALUES "
+                "(1, 1, 'HOME_WIN', 1), (2, 1, 'HOME_WIN', NULL), (3, 1, 'DRAW', NULL), (4, 1, 'DRAW', NULL)"
+            ))
+            await signal_unique_index(conn)
+            await signal_unique_index(conn)
+            kept = [row[0] for row in await conn.execute(text("SELECT id FROM signals ORDER BY id"))]
+        await legacy_engine.dispose()
+        assert kept == [1, 4], kept
+        print("PASS: Signals upsert on (match_id, suggested_bet) and legacy duplicates are collapsed")
+
+    asyncio.run(_test())
+
+
+def test_pipeline_process_pool():
+    async def _run(workers: int):
+        from sqlalchemy import select
+        from config.settings import settings
+        from data.models.signal import Signal
+        from services.data_fetch.standings_service import StandingsService
+        from services.processing.signal_compute import shutdown_executor
+        from services.processing.signal_pipeline_service import SignalPipelineService
+
+        original = (settings.ANALYSIS_WORKERS, settings.ANALYSIS_CHUNK_SIZE)
+        settings.ANALYSIS_WORKERS, settings.ANALYSIS_CHUNK_SIZE = workers, 2
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                await _seed_slate(session, 5)
+                await SignalPipelineService(session, StandingsService(session, None)).execute_full_analysis()
+                rows = (await session.execute(
+                    select(Signal.match_id, Signal.suggested_bet, Signal.value_edge, Signal.recommended_stake)
+                    .order_by(Signal.match_id, Signal.rank_in_match)
+                )).all()
+        finally:
+            shutdown_executor()
+            settings.ANALYSIS_WORKERS, settings.ANALYSIS_CHUNK_SIZE = original
+            await memory_engine.dispose()
+        return [tuple(r) for r in rows]
+
+    inline = asyncio.run(_run(0))
+    pooled = asyncio.run(_run(2))
+    assert inline and inline == pooled
+    print(f"PASS: Process-pool analysis matches inline ({len(pooled)} signals)")
+
+
+def test_staged_pipeline():
+    async def _run(chunk_size: int, queue_size: int):
+        from sqlalchemy import select
+        from config.settings import settings
+        from data.models.signal import Signal
+        from services.data_fetch.standings_service import StandingsService
+        from services.processing.signal_pipeline_service import SignalPipelineService
+
+        original = (settings.ANALYSIS_CHUNK_SIZE, settings.PIPELINE_QUEUE_SIZE)
+        settings.ANALYSIS_CHUNK_SIZE, settings.PIPELINE_QUEUE_SIZE = chunk_size, queue_size
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                await _seed_slate(session, 7)
+                pipeline = SignalPipelineService(session, StandingsService(session, None))
+                await pipeline.execute_full_analysis()
+                rows = (await session.execute(
+                    select(Signal.match_id, Signal.suggested_bet, Signal.rank_in_match, Signal.value_edge)
+                    .order_by(Signal.match_id, Signal.rank_in_match)
+                )).all()
+        finally:
+            settings.ANALYSIS_CHUNK_SIZE, settings.PIPELINE_QUEUE_SIZE = original
+            await memory_engine.dispose()
+        return [tuple(r) for r in rows], pipeline.stage_stats
+
+    whole, _ = asyncio.run(_run(chunk_size=50, queue_size=2))
+    staged, stats = asyncio.run(_run(chunk_size=2, queue_size=1))
+    assert whole and staged == whole
+    assert stats["load"]["chunks"] == stats["compute"]["chunks"] == stats["persist"]["chunks"] == 4
+    assert all(stage["matches"] == 7 for stage in stats.values())
+    print(f"PASS: Staged pipeline matches single-chunk run ({len(staged)} signals over 4 chunks)")
+
+
+def test_incremental_reanalysis():
+    async def _test():
+        from datetime import datetime
+        from data.models.odds import Odds
+        from services.data_fetch.standings_service import StandingsService
+        from services.processing.signal_pipeline_service import SignalPipelineService
+
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                upcoming = await _seed_slate(session, 5)
+                pipeline = SignalPipelineService(session, StandingsService(session, None))
+
+                await pipeline.execute_full_analysis()
+                first = pipeline.stage_stats["compute"]["matches"]
+                assert all(m.analysis_fingerprint for m in upcoming)
+
+                await pipeline.execute_full_analysis()
+                unchanged = pipeline.stage_stats["compute"]["matches"]
+
+                session.add(Odds(
+                    match_id=upcoming[2].id, recorded_at=datetime.utcnow(),
+                    home_odds=2.1, draw_odds=3.4, away_odds=3.6, over_25_odds=1.9, under_25_odds=1.95,
+                ))
+                await session.commit()
+                await pipeline.execute_full_analysis()
+                changed = pipeline.stage_stats["compute"]["matches"]
+
+                await pipeline.execute_full_analysis(force=True)
+                forced = pipeline.stage_stats["compute"]["matches"]
+        finally:
+            await memory_engine.dispose()
+        return first, unchanged, changed, forced
+
+    first, unchanged, changed, forced = asyncio.run(_test())
+    assert (first, unchanged, changed, forced) == (5, 0, 1, 5)
+    print("PASS: Unchanged matches are skipped; new odds re-analyze only their match")
+
+
+def test_daily_runner_concurrent_fetch():
+    import time
+    from config.settings import settings
+    from services.scheduling.daily_runner import DailyRunner
+
+    class SlowFootball:
+        async def fetch_epl_matches(self):
+            await asyncio.sleep(0.2)
+            return {"matches": []}
+
+        async def fetch_epl_standings(self):
+            await asyncio.sleep(0.2)
+            return {"standings": []}
+
+    class HangingOdds:
+        async def fetch_latest_odds(self):
+            await asyncio.sleep(5)
+            return []
+
+    runner = DailyRunner()
+    runner.football_service, runner.odds_service = SlowFootball(), HangingOdds()
+    original = settings.ODDS_FETCH_TIMEOUT
+    settings.ODDS_FETCH_TIMEOUT = 0.3
+    try:
+        start = time.perf_counter()
+        payloads = asyncio.run(runner._fetch_all())
+        elapsed = time.perf_counter() - start
+    finally:
+        settings.ODDS_FETCH_TIMEOUT = original
+
+    assert payloads == {"matches": {"matches": []}, "standings": {"standings": []}, "odds": None}
+    assert elapsed < 0.6, elapsed
+    print(f"PASS: Daily fetches run concurrently ({elapsed:.2f}s), timed-out odds stage isolated")
+
+
+def test_shared_http_clients():
+    from services.data_fetch import http_client
+
+    async def _test():
+        football = http_client.get_client("https://api.football-data.org/v4", timeout=30)
+        again = http_client.get_client("https://api.football-data.org/v4/competitions", timeout=30)
+        odds = http_client.get_client("https://api.the-odds-api.com/v4/sports/soccer_epl/odds", timeout=12)
+        assert football is again and football is not odds
+        assert odds.timeout.read == 12
+        await http_client.close_clients()
+        assert football.is_closed and odds.is_closed
+        assert http_client.get_client("https://api.football-data.org/v4") is not football
+        await http_client.close_clients()
+
+    asyncio.run(_test())
+    print("PASS: API services share one pooled client per host")
+
+
+def test_football_data_rate_limiting():
+    import httpx
+    from config.settings import settings
+    from services.data_fetch import http_client
+    from services.data_fetch.football_data_service import FootballDataService
+    from services.data_fetch.rate_limiter import PRIORITY_BACKFILL, PRIORITY_CYCLE, RateLimiter
+
+    async def _lanes():
+        limiter = RateLimiter(rate_per_minute=600, capacity=1)
+        await limiter.acquire()
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        backfill = [asyncio.create_task(call(f"backfill{i}", PRIORITY_BACKFILL)) for i in range(2)]
+        await asyncio.sleep(0)
+        cycle = asyncio.create_task(call("cycle", PRIORITY_CYCLE))
+        await asyncio.gather(*backfill, cycle)
+        return order
+
+    assert asyncio.run(_lanes()) == ["cycle", "backfill0", "backfill1"]
+
+    async def _retry():
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"standings": []}, headers={"X-Requests-Available-Minute": "9"})
+
+        service = FootballDataService()
+        http_client._clients["api.football-data.org"] = (
+            asyncio.get_running_loop(), httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        original = settings.HTTP_CACHE_DIR
+        settings.HTTP_CACHE_DIR = ""
+        try:
+            data = await service.fetch_epl_standings()
+        finally:
+            settings.HTTP_CACHE_DIR = original
+            await http_client.close_clients()
+        return data, calls
+
+    data, calls = asyncio.run(_retry())
+    assert data == {"standings": []} and len(calls) == 2
+    print("PASS: Rate limiter serves cycle lane first and retries after 429")
+
+
+def test_conditional_response_cache():
+    import tempfile
+    import httpx
+    from config.settings import settings
+    from services.data_fetch import http_client
+    from services.data_fetch.football_data_service import FootballDataService
+
+    body = {"standings": [{"type": "TOTAL", "table": []}]}
+    seen = []
+    outage = []
+
+    def handler(request):
+        if outage:
+            if outage[0] == "down":
+                raise httpx.ConnectError("unreachable", request=request)
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=body, headers={"ETag": '"v1"'})
+
+    async def _fetch_all_modes():
+        http_client._clients["api.football-data.org"] = (
+            asyncio.get_running_loop(), httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        service = FootballDataService()
+        try:
+            first = await service.fetch_epl_standings()
+            cached = await service.fetch_epl_standings()
+            settings.HTTP_CACHE_TTLS = {}
+            revalidated = await service.fetch_epl_standings()
+            # Transient failures fall back to the expired body on disk.
+            outage.append("down")
+            unreachable = await service.fetch_epl_standings()
+            outage[0] = "limited"
+            limited = await service.fetch_epl_standings()
+        finally:
+            await http_client.close_clients()
+        return first, cached, revalidated, unreachable, limited
+
+    original = (settings.HTTP_CACHE_DIR, settings.HTTP_CACHE_TTLS, settings.FOOTBALL_DATA_MAX_RETRIES)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        settings.HTTP_CACHE_DIR = cache_dir
+        settings.HTTP_CACHE_TTLS = {"competitions/PL/standings": 600}
+        settings.FOOTBALL_DATA_MAX_RETRIES = 0
+        try:
+            results = asyncio.run(_fetch_all_modes())
+        finally:
+            settings.HTTP_CACHE_DIR, settings.HTTP_CACHE_TTLS, settings.FOOTBALL_DATA_MAX_RETRIES = original
+
+    assert all(r == body for r in results)
+    assert seen == [None, '"v1"']
+    print("PASS: Response cache serves fresh entries locally, revalidates with ETag and covers outages")
+
+
+def _fixture_payload(n_teams: int = 20):
+    teams = [{"id": 100 + i, "name": f"Club {i} FC", "shortName": f"Club {i}", "tla": f"C{i:02d}"} for i in range(n_teams)]
+    matches, ext_id = [], 9000
+    for i, home in enumerate(teams):
+        for j, away in enumerate(teams):
+            if i == j:
+                continue
+            ext_id += 1
+            finished = ext_id % 2 == 0
+            matches.append({
+                "id": ext_id, "utcDate": f"2026-0{1 + ext_id % 9}-1{ext_id % 10}T15:00:00Z",
+                "status": "FINISHED" if finished else "SCHEDULED", "matchday": 1 + ext_id % 38,
+                "homeTeam": home, "awayTeam": away,
+                "score": {"fullTime": {"home": ext_id % 4 if finished else None, "away": ext_id % 3 if finished else None},
+                          "halfTime": {"home": 0 if finished else None, "away": 0 if finished else None}},
+            })
+    return matches
+
+
+def test_differential_match_sync():
+    async def _test():
+        from sqlalchemy import event, select, func
+        from data.models.match import Match
+        from services.processing.match_sync_service import MatchSyncService
+
+        payload = _fixture_payload()
+        memory_engine, session_factory = await _memory_db()
+        statements = []
+        event.listen(
+            memory_engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        try:
+            async with session_factory() as session:
+                first = await MatchSyncService(session).sync(payload)
+                await session.commit()
+                initial_statements = len(statements)
+
+                statements.clear()
+                unchanged = await MatchSyncService(session).sync(payload)
+                unchanged_statements = len(statements)
+
+                payload[5]["score"]["fullTime"]["home"] = 7
+                payload[6]["status"] = "FINISHED"
+                changed = await MatchSyncService(session).sync(payload)
+                await session.commit()
+
+                stored = (await session.execute(
+                    select(Match.home_score).where(Match.external_id == payload[5]["id"])
+                )).scalar_one()
+                total = (await session.execute(select(func.count(Match.id)))).scalar_one()
+        finally:
+            await memory_engine.dispose()
+        return first, initial_statements, unchanged, unchanged_statements, changed, stored, total
+
+    first, initial_statements, unchanged, unchanged_statements, changed, stored, total = asyncio.run(_test())
+    assert first == {"teams": 20, "matches": 380, "teams_written": 20, "matches_written": 380}
+    assert initial_statements <= 5, initial_statements
+    assert unchanged["teams_written"] == unchanged["matches_written"] == 0
+    assert unchanged_statements == 2, unchanged_statements
+    assert changed["teams_written"] == 0 and changed["matches_written"] == 2
+    assert stored == 7 and total == 380
+    print(f"PASS: Differential sync writes 380 fixtures in {initial_statements} statements, no-op in {unchanged_statements}")
+
+
+def test_team_alias_resolution():
+    async def _test():
+        from data.models.team import Team
+        from data.migrations import drop_guessed_aliases
+        from data.models.team_alias import TeamAlias
+        from data.repositories.team_alias_repo import TeamAliasRepository
+        from services.processing.team_resolver import TeamResolver
+
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                names = [
+                    ("Manchester United FC", "Man United", "MUN"), ("Manchester City FC", "Man City", "MCI"),
+                    ("Brighton & Hove Albion FC", "Brighton Hove", "BHA"),
+                    ("Wolverhampton Wanderers FC", "Wolverhampton", "WOL"), ("Leicester City FC", "Leicester City", "LEI"),
+                    ("Nottingham Forest FC", "Nottingham", "NOT"), ("Newcastle United FC", "Newcastle", "NEW"),
+                ]
+                teams = [Team(external_id=200 + i, name=n, short_name=s, tla=t) for i, (n, s, t) in enumerate(names)]
+                session.add_all(teams)
+                await session.flush()
+                mun, mci, bha, wol, lei, nfo, _ = (t.id for t in teams)
+
+                resolver = TeamResolver(session)
+                await resolver.load()
+                resolved = {name: resolver.resolve(name) for name in (
+                    "Manchester United", "Man Utd", "Man City", "Brighton and Hove Albion",
+                    "Wolves", "Leicester", "Nott'm Forest", "Manchester", "Everton", "Newcastle Jets",
+                )}
+                assert resolver.resolve("Manchester") is None
+                await resolver.save()
+                await session.commit()
+
+                unresolved = {a.raw_name: a.seen_count for a in await TeamAliasRepository(session).get_unresolved()}
+                # Token-overlap guesses ("Leicester", "Nott'm Forest") are not stored as aliases.
+                stored = {a.alias for a in await TeamAliasRepository(session).get_all() if a.team_id is not None}
+                assert stored.isdisjoint({"leicester", "nottingham forest"}), stored
+                await TeamAliasRepository(session).map_alias("everton", lei)
+                reloaded = TeamResolver(session)
+                await reloaded.load()
+                mapped = reloaded.resolve("Everton"), reloaded.resolve("Wolves")
+
+                # Migration 5 drops automatic mappings from older resolvers but keeps admin ones.
+                session.add(TeamAlias(alias="newcastle olympic", raw_name="Newcastle Olympic", team_id=teams[-1].id))
+                await session.flush()
+                await drop_guessed_aliases(await session.connection())
+                remaining = {a.alias for a in await TeamAliasRepository(session).get_all() if a.team_id is not None}
+                assert remaining == {"everton"}, remaining
+        finally:
+            await memory_engine.dispose()
+        return resolved, unresolved, mapped, (mun, mci, bha, wol, lei, nfo)
+
+    from utils.team_names import normalize_team_name
+
+    resolved, unresolved, mapped, (mun, mci, bha, wol, lei, nfo) = asyncio.run(_test())
+    assert normalize_team_name("Nott'm Forest") == normalize_team_name("Nott\u2019m Forest") == "nottingham forest"
+    assert resolved == {
+        "Manchester United": mun, "Man Utd": mun, "Man City": mci, "Brighton and Hove Albion": bha,
+        "Wolves": wol, "Leicester": lei, "Nott'm Forest": nfo, "Manchester": None, "Everton": None,
+        "Newcastle Jets": None,
+    }
+    assert unresolved == {"Manchester": 2, "Everton": 1, "Newcastle Jets": 1}
+    assert mapped == (lei, wol)
+    print("PASS: Team aliases resolve exact/token names, refuse ambiguous ones and record unresolved")
+
+
+def test_set_based_settlement():
+    async def _test():
+        from sqlalchemy import select
+        from sqlalchemy.orm import selectinload
+        from core import market_registry
+        from data.models.signal import Signal
+        from services.data_fetch.standings_service import StandingsService
+        from services.learning.settlement_service import SettlementService
+        from services.processing.signal_pipeline_service import SignalPipelineService
+
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                upcoming = await _seed_slate(session, 8)
+                await SignalPipelineService(session, StandingsService(session, None)).execute_full_analysis()
+                for i, match in enumerate(upcoming):
+                    match.status = "FINISHED"
+                    match.home_score, match.away_score = i % 4, (i * 3) % 5
+                    match.home_ht_score, match.away_ht_score = (None, None) if i % 3 == 0 else (0, min(1, (i * 3) % 5))
+                # A typo'd bet type stays pending instead of failing the batch.
+                session.add(Signal(match_id=upcoming[1].id, suggested_bet="UNKNOWN", value_edge=0.1,
+                                   bookmaker_odds=2.0, recommended_stake=1.0, confidence_score=0.5))
+                await session.commit()
+
+                settled = await SettlementService(session).settle_pending()
+                await session.commit()
+                session.expunge_all()
+                rows = (await session.execute(select(Signal).options(selectinload(Signal.match)))).scalars().all()
+                again = await SettlementService(session).settle_pending()
+        finally:
+            await memory_engine.dispose()
+
+        expected = [
+            market_registry.settle(s.suggested_bet, s.match.home_score, s.match.away_score,
+                                   s.match.home_ht_score, s.match.away_ht_score)
+            for s in rows
+        ]
+        return settled, again, [s.result_won for s in rows], expected
+
+    settled, again, results, expected = asyncio.run(_test())
+    assert results == expected
+    assert settled == sum(r is not None for r in expected) > 0
+    assert again == 0 and None in results
+    print(f"PASS: Set-based settlement resolved {settled} signals in one pass")
+
+
+def test_batched_performance_updates():
+    async def _test():
+        from sqlalchemy import event, select
+        from data.models.bankroll import BankrollHistory
+        from data.models.pattern_stat import PatternStat
+        from data.models.signal import Signal
+        from data.repositories.bankroll_repo import BankrollRepository
+        from services.learning.performance_update_service import PerformanceUpdateService
+
+        memory_engine, session_factory = await _memory_db()
+        statements = []
+        try:
+            async with session_factory() as session:
+                upcoming = await _seed_slate(session, 6)
+                await BankrollRepository(session).initialize_if_empty()
+                session.add(PatternStat(pattern_name="home_fortress", occurrences=4, wins=3, losses=1))
+                signals = []
+                for i, match in enumerate(upcoming):
+                    for bet in ("HOME_WIN", "OVER_2.5"):
+                        signals.append(Signal(
+                            match_id=match.id, suggested_bet=bet, value_edge=0.1, bookmaker_odds=2.0 + i / 10,
+                            recommended_stake=10.0, confidence_score=0.6,
+                            patterns_detected="home_fortress, goal_fest" if bet == "OVER_2.5" else None,
+                        ))
+                session.add_all(signals)
+                await session.commit()
+
+                settled = [(s, (k % 3) != 0) for k, s in enumerate(signals)]
+                event.listen(
+                    memory_engine.sync_engine, "before_cursor_execute",
+                    lambda conn, cursor, statement, *args: statements.append(statement),
+                )
+                await PerformanceUpdateService(session).process_settled(settled)
+                await session.commit()
+                n_statements = len(statements)
+
+                stats = {p.pattern_name: (p.occurrences, p.wins, p.losses, round(p.reliability_score, 4))
+                         for p in (await session.execute(select(PatternStat))).scalars()}
+                ledger = (await session.execute(
+                    select(BankrollHistory).order_by(BankrollHistory.timestamp, BankrollHistory.id)
+                )).scalars().all()
+                current = await BankrollRepository(session).get_current_balance()
+        finally:
+            await memory_engine.dispose()
+        return settled, n_statements, stats, ledger, current
+
+    settled, n_statements, stats, ledger, current = asyncio.run(_test())
+    over = [won for s, won in settled if s.patterns_detected]
+    assert stats["goal_fest"] == (len(over), sum(over), len(over) - sum(over), round(sum(over) / len(over), 4))
+    assert stats["home_fortress"][:3] == (4 + len(over), 3 + sum(over), 1 + len(over) - sum(over))
+
+    balance = 1000.0
+    expected = []
+    for match_id in dict.fromkeys(s.match_id for s, _ in settled):
+        pnl = sum(s.recommended_stake * (s.bookmaker_odds - 1) if won else -s.recommended_stake
+                  for s, won in settled if s.match_id == match_id)
+        balance += pnl
+        expected.append((match_id, round(balance, 6)))
+    assert [(e.match_id, round(e.balance, 6)) for e in ledger[1:]] == expected
+    # One real timestamp for the batch; order comes from the id tie-break.
+    assert len({e.timestamp for e in ledger[1:]}) == 1
+    assert abs(current - balance) < 1e-9
+    assert n_statements <= 4, n_statements
+    print(f"PASS: Settlement updates patterns and ledger in {n_statements} statements")
+
+
+def test_schema_migrations():
+    async def _upgrade():
+        from sqlalchemy import text
+        from data.migrations import MIGRATIONS, HOT_PATH_INDEXES, current_version, run_migrations
+
+        memory_engine, _ = await _memory_db()
+        index_names = [s.split()[5] for s in HOT_PATH_INDEXES]
+        try:
+            async with memory_engine.begin() as conn:
+                # Roll the schema back to what a pre-migration database looked like.
+                for name in index_names + ["ux_signals_match_bet"]:
+                    await conn.execute(text(f"DROP INDEX {name}"))
+                await conn.execute(text("ALTER TABLE matches DROP COLUMN analysis_fingerprint"))
+                first = await run_migrations(conn)
+                second = await run_migrations(conn)
+                version = await current_version(conn)
+                indexes = {row[0] for row in await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+                columns = {row[1] for row in await conn.execute(text("PRAGMA table_info(matches)"))}
+        finally:
+            await memory_engine.dispose()
+        assert first == len(MIGRATIONS) and second == 0 and version == MIGRATIONS[-1][0]
+        assert set(index_names) | {"ux_signals_match_bet"} <= indexes
+        assert "analysis_fingerprint" in columns
+
+    async def _plans():
+        import re
+        from sqlalchemy import event
+        from data.repositories.bankroll_repo import BankrollRepository
+        from data.repositories.match_repo import MatchRepository
+        from data.repositories.odds_repo import OddsRepository
+        from data.repositories.signal_repo import SignalRepository
+
+        memory_engine, session_factory = await _memory_db()
+        selects = []
+        try:
+            async with session_factory() as session:
+                upcoming = await _seed_slate(session, 3)
+                event.listen(
+                    memory_engine.sync_engine, "before_cursor_execute",
+                    lambda conn, cursor, statement, params, *args:
+                        selects.append((statement, params)) if statement.lstrip().startswith("SELECT") else None,
+                )
+                matches, odds = MatchRepository(session), OddsRepository(session)
+                signals, bankroll = SignalRepository(session), BankrollRepository(session)
+                team_ids = [m.home_team_id for m in upcoming]
+                match_ids = [m.id for m in upcoming]
+                await matches.get_upcoming()
+                await matches.get_home_matches(team_ids[0])
+                await matches.get_home_matches_for_teams(team_ids)
+                await matches.get_away_matches_for_teams(team_ids)
+                await odds.get_latest_for_match(match_ids[0])
+                await odds.get_latest_for_matches(match_ids)
+                await signals.get_by_match_ids(match_ids)
+                await signals.get_pending_for_finished()
+                await signals.get_performance_stats()
+                await signals.get_by_matchday(1)
+                await bankroll.get_current_balance()
+
+                conn = await session.connection()
+                full_scans = []
+                for statement, params in selects:
+                    plan = (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params)).all()
+                    full_scans += [row[3] for row in plan if re.fullmatch(
+                        r"SCAN (matches|odds_history|signals|standings_snapshots|bankroll_history)", row[3]
+                    )]
+        finally:
+            await memory_engine.dispose()
+        return len(selects), full_scans
+
+    asyncio.run(_upgrade())
+    n_queries, full_scans = asyncio.run(_plans())
+    assert not full_scans, full_scans
+    print(f"PASS: Migrations upgrade a legacy schema in place; {n_queries} hot-path queries use indexes")
+
+
+def test_sqlite_profile_and_read_engine():
+    import tempfile
+    import time
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from data.database import Base, _make_engine
+
+    async def _test(url: str):
+        import data.models  # noqa: F401
+        writer, reader = _make_engine(url), _make_engine(url, read_only=True)
+        try:
+            async with writer.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(text("INSERT INTO teams (external_id, name) VALUES (1, 'Arsenal')"))
+            async with writer.connect() as conn:
+                pragmas = {name: (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                           for name in ("journal_mode", "synchronous", "temp_store", "busy_timeout")}
+
+            async with writer.connect() as write_conn:
+                # Hold an open write transaction, as the daily cycle does while committing signals.
+                await write_conn.execute(text("BEGIN IMMEDIATE"))
+                await write_conn.execute(text("INSERT INTO teams (external_id, name) VALUES (2, 'Chelsea')"))
+                start = time.perf_counter()
+                async with reader.connect() as read_conn:
+                    visible = (await read_conn.execute(text("SELECT COUNT(*) FROM teams"))).scalar()
+                    try:
+                        await read_conn.execute(text("DELETE FROM teams"))
+                        read_only = False
+                    except OperationalError:
+                        read_only = True
+                read_wait = time.perf_counter() - start
+                await write_conn.execute(text("COMMIT"))
+        finally:
+            await reader.dispose()
+            await writer.dispose()
+        return pragmas, visible, read_only, read_wait
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pragmas, visible, read_only, read_wait = asyncio.run(_test(f"sqlite+aiosqlite:///{tmp}/profile.db"))
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1, "temp_store": 2, "busy_timeout": 5000}, pragmas
+    assert visible == 1 and read_only
+    assert read_wait < 0.5, read_wait
+    print(f"PASS: WAL profile applied; reader served in {read_wait * 1000:.0f}ms during an open write")
+
+
+def test_current_standings_table():
+    def _table(matchday: int, leader: int) -> dict:
+        order = [leader] + [i for i in range(20) if i != leader]
+        return {
+            "season": {"currentMatchday": matchday},
+            "standings": [{"type": "TOTAL", "table": [
+                {"position": pos, "team": {"id": 1000 + i}, "playedGames": matchday, "points": 60 - pos}
+                for pos, i in enumerate(order, 1)
+            ]}],
+        }
+
+    async def _test():
+        from sqlalchemy import func, select, text
+        from data.migrations import compact_standings
+        from data.models.current_standing import CurrentStanding
+        from data.models.standing_snapshot import StandingSnapshot
+        from data.models.team import Team
+        from data.repositories.standing_repo import StandingRepository
+        from services.data_fetch.standings_service import StandingsService
+
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                session.add_all(Team(external_id=1000 + i, name=f"Team {i}") for i in range(20))
+                await session.commit()
+
+                service = StandingsService(session, football_service=None)
+                counts = lambda model: session.scalar(select(func.count()).select_from(model))
+                await service.store_standings(_table(5, 0))
+                await service.store_standings(_table(5, 3))
+                await session.commit()
+                same_day = (await counts(CurrentStanding), await counts(StandingSnapshot))
+
+                await service.store_standings(_table(6, 7))
+                await session.commit()
+                next_day = (await counts(CurrentStanding), await counts(StandingSnapshot))
+
+                pipeline_view = [s.team_id for s in await service.get_latest_standings()]
+                latest = await StandingRepository(session).get_latest()
+
+            async with memory_engine.begin() as conn:
+                # Legacy history: an appended snapshot per fetch, no matchday, no current table.
+                await conn.execute(text("DROP INDEX ux_standings_team_matchday"))
+                await conn.execute(text("UPDATE standings_snapshots SET matchday = NULL"))
+                await conn.execute(text(
+                    "INSERT INTO standings_snapshots (team_id, position, played, points, snapshot_date) "
+                    "SELECT team_id, position, played, points, datetime(snapshot_date, '-1 hour') FROM standings_snapshots"
+                ))
+                await conn.execute(text("DELETE FROM current_standings"))
+                await compact_standings(conn)
+                legacy = (
+                    (await conn.execute(text("SELECT COUNT(*) FROM standings_snapshots"))).scalar(),
+                    (await conn.execute(text("SELECT COUNT(*) FROM current_standings"))).scalar(),
+                    (await conn.execute(text("SELECT MIN(played) FROM current_standings"))).scalar(),
+                )
+        finally:
+            await memory_engine.dispose()
+        return same_day, next_day, latest, pipeline_view, legacy
+
+    same_day, next_day, latest, pipeline_view, legacy = asyncio.run(_test())
+    assert same_day == (20, 20), same_day
+    assert next_day == (20, 40), next_day
+    assert [s.position for s in latest] == list(range(1, 21))
+    assert latest[0].team.name == "Team 7" and latest[0].played == 6
+    assert pipeline_view == [s.team_id for s in latest]
+    assert legacy == (40, 20, 6), legacy
+    print("PASS: current standings replaced per update; history compacted to one row per team and matchday")
+
+
+def test_daily_cycle_recomputes_only_changed_inputs():
+    from datetime import datetime, timedelta
+    from services.scheduling import daily_runner
+
+    now = datetime.utcnow()
+    clubs = [{"id": 300 + i, "name": f"Side {i} FC", "shortName": f"Side {i}", "tla": f"S{i:02d}"} for i in range(6)]
+    fixtures = []
+    for n, (home, away) in enumerate((h, a) for h in clubs for a in clubs if h is not a):
+        upcoming = n % 3 == 0
+        fixtures.append({
+            "id": 7000 + n, "matchday": 1 + n % 10, "homeTeam": home, "awayTeam": away,
+            "utcDate": (now + timedelta(days=1 + n % 5) if upcoming else now - timedelta(days=30 - n % 20)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "status": "SCHEDULED" if upcoming else "FINISHED",
+            "score": {"fullTime": {"home": None if upcoming else n % 4, "away": None if upcoming else n % 3},
+                      "halfTime": {"home": None if upcoming else 0, "away": None if upcoming else 0}},
+        })
+    standings = {"season": {"currentMatchday": 10}, "standings": [{"type": "TOTAL", "table": [
+        {"position": i + 1, "team": {"id": c["id"]}, "playedGames": 10, "points": 30 - i} for i, c in enumerate(clubs)
+    ]}]}
+    odds = [{
+        "home_team": f["homeTeam"]["name"], "away_team": f["awayTeam"]["name"],
+        "bookmakers": [{"markets": [
+            {"key": "h2h", "outcomes": [{"name": f["homeTeam"]["name"], "price": 1.6},
+                                       {"name": "Draw", "price": 4.2}, {"name": f["awayTeam"]["name"], "price": 5.5}]},
+            {"key": "totals", "outcomes": [{"name": "Over", "point": 2.5, "price": 1.8},
+                                          {"name": "Under", "point": 2.5, "price": 2.05}]},
+        ]}],
+    } for f in fixtures if f["status"] == "SCHEDULED"]
+
+    class Football:
+        async def fetch_epl_matches(self):
+            return {"matches": fixtures}
+
+        async def fetch_epl_standings(self):
+            return standings
+
+    class Odds:
+        async def fetch_latest_odds(self):
+            return odds
+
+    async def _test():
+        memory_engine, session_factory = await _memory_db()
+        original = daily_runner.AsyncSessionLocal
+        daily_runner.AsyncSessionLocal = session_factory
+        try:
+            runner = daily_runner.DailyRunner()
+            runner.football_service, runner.odds_service = Football(), Odds()
+            return [await runner.run_daily_cycle() for _ in range(6)]
+        finally:
+            daily_runner.AsyncSessionLocal = original
+            await memory_engine.dispose()
+
+    cycles = asyncio.run(_test())
+    assert all(c["odds"] == len(odds) and c["standings"] == 6 for c in cycles)
+    # Each identical snapshot still moves the market-confidence stability bonus
+    # until there are five of them; after that nothing the analysis reads changes.
+    assert [c["analyzed"] for c in cycles] == [len(odds)] * 5 + [0], [c["analyzed"] for c in cycles]
+    print(f"PASS: Identical odds snapshots recompute until the stability bonus saturates, then 0 of {len(odds)}")
+
+
+def test_placed_signals_survive_recompute():
+    async def _test():
+        from sqlalchemy import select
+        from data.models.signal import Signal
+        from data.repositories.signal_repo import SignalRepository
+
+        memory_engine, session_factory = await _memory_db()
+        try:
+            async with session_factory() as session:
+                match = (await _seed_slate(session, 1))[0]
+                repo = SignalRepository(session)
+                row = lambda bet, odds, stake: {
+                    "match_id": match.id, "suggested_bet": bet, "value_edge": 0.08,
+                    "bookmaker_odds": odds, "recommended_stake": stake, "confidence_score": 0.6,
+                }
+                placed, dropped, kept = await repo.add_many([
+                    row("OVER_2.5", 1.73, 50.0), row("HOME_WIN", 2.1, 20.0), row("BTTS_YES", 1.9, 10.0),
+                ])
+                await repo.mark_published(placed.id)
+                await session.commit()
+
+                # Recompute re-picks the placed bet at a new price, keeps BTTS and drops HOME_WIN.
+                regenerated = await repo.add_many([row("OVER_2.5", 1.95, 80.0), row("BTTS_YES", 1.85, 12.0)])
+                await repo.delete_pending_for_matches([match.id], keep_ids=[s.id for s in regenerated])
+                await session.commit()
+                session.expunge_all()
+                stored = {s.suggested_bet: s for s in (await session.execute(select(Signal))).scalars().all()}
+        finally:
+            await memory_engine.dispose()
+        return stored
+
+    stored = asyncio.run(_test())
+    assert set(stored) == {"OVER_2.5", "BTTS_YES"}, set(stored)
+    assert (stored["OVER_2.5"].bookmaker_odds, stored["OVER_2.5"].recommended_stake) == (1.73, 50.0)
+    assert stored["OVER_2.5"].is_published and stored["BTTS_YES"].bookmaker_odds == 1.85
+    print("PASS: Placed signals are neither overwritten nor deleted when their match is recomputed")
+
+
+def test_failed_compute_keeps_pending_signals():
+    from services.processing import signal_pipeline_service
+
+    async def _test():
+        from data.repositories.signal_repo import SignalRepository
+        from services.data_fetch.standings_service import StandingsService
+
+        memory_engine, session_factory = await _memory_db()
+        original = signal_pipeline_service.analyze_chunk
+        try:
+            async with session_factory() as session:
+                await _seed_slate(session, 6)
+                pipeline = signal_pipeline_service.SignalPipelineService(session, StandingsService(session, None))
+                await pipeline.execute_full_analysis()
+                repo = SignalRepository(session)
+                before = await repo.get_by_match_ids([m.id for m in await pipeline.match_repo.get_upcoming()])
+                failing = next(match_id for match_id, signals in before.items() if signals)
+
+                # The compute stage logs and omits a match it cannot analyze.
+                signal_pipeline_service.analyze_chunk = lambda jobs, context: [
+                    r for r in original(jobs, context) if r["match_id"] != failing
+                ]
+                await pipeline.execute_full_analysis(force=True)
+                after = await repo.get_by_match_ids(list(before))
+        finally:
+            signal_pipeline_service.analyze_chunk = original
+            await memory_engine.dispose()
+        return before[failing], after[failing]
+
+    before, after = asyncio.run(_test())
+    assert before and sorted(s.id for s in after) == sorted(s.id for s in before)
+    print(f"PASS: A match that fails to compute keeps its {len(before)} pending signals")
+
+
+def test_compute_isolates_bad_match():
+    from services.processing.signal_compute import SignalCompute, MatchRef, ScoreLine
+
+    history = [ScoreLine(2, 1, 1, 0), ScoreLine(0, 0, 0, 0), ScoreLine(3, 1, 1, 1)]
+    jobs = [{
+        "match": MatchRef(i, 10 + i, 20 + i), "home_history": history, "away_history": history,
+        "odds": {"home_odds": 2.4, "draw_odds": 3.4, "away_odds": 3.1, "over_25_odds": 1.9, "under_25_odds": 1.95},
+        "odds_history": [],
+    } for i in range(4)]
+    jobs[1]["odds"]["home_odds"] = "n/a"
+    context = {"standings": [], "bankroll": 1000.0, "pattern_stats": {}}
+
+    results = SignalCompute().run(jobs, context)
+    assert [r["match_id"] for r in results] == [0, 2, 3]
+    print("PASS: A match that breaks batch evaluation is dropped, the rest of the chunk is kept")
+
+
+def test_analyze_chunk_serializes_threads():
+    import threading
+    import time
+    from services.processing import signal_compute
+    from services.processing.signal_compute import MatchRef, ScoreLine
+
+    active, overlaps = [0], []
+    original = signal_compute.SignalCompute.run
+
+    def tracked_run(self, jobs, context):
+        active[0] += 1
+        overlaps.append(active[0])
+        time.sleep(0.02)
+        try:
+            return original(self, jobs, context)
+        finally:
+            active[0] -= 1
+
+    history = [ScoreLine(2, 1, 1, 0), ScoreLine(1, 1, 0, 0)]
+    jobs = [{
+        "match": MatchRef(1, 10, 20), "home_history": history, "away_history": history,
+        "odds": {"home_odds": 2.4, "draw_odds": 3.4, "away_odds": 3.1}, "odds_history": [],
+    }]
+    context = {"standings": [], "bankroll": 1000.0, "pattern_stats": {}}
+    results = []
+
+    signal_compute.SignalCompute.run = tracked_run
+    try:
+        threads = [
+            threading.Thread(target=lambda: results.append(signal_compute.analyze_chunk(jobs, context)))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        signal_compute.SignalCompute.run = original
+
+    assert len(results) == 4 and max(overlaps) == 1, overlaps
+    print("PASS: Overlapping in-process analyses share the compute engines one thread at a time")
+
+
 if __name__ == "__main__":
     tests = [
         test_core_is_pure_brain,
+        test_utils_are_leaf_helpers,
         test_bot_has_no_core_math,
         test_bot_has_no_direct_db_queries,
         test_core_engines_instantiate,
@@ -204,6 +1489,36 @@ if __name__ == "__main__":
         test_pattern_engine,
         test_database_init,
         test_idempotent_upsert,
+        test_probability_engine_batch,
+        test_score_distribution_markets,
+        test_poisson_pmf_cache,
+        test_adaptive_grid_truncation,
+        test_closed_form_fast_path,
+        test_score_table_lookup,
+        test_market_registry,
+        test_value_detector_batch,
+        test_devig_methods,
+        test_pipeline_preload_query_count,
+        test_signal_bulk_upsert,
+        test_pipeline_process_pool,
+        test_staged_pipeline,
+        test_incremental_reanalysis,
+        test_daily_runner_concurrent_fetch,
+        test_shared_http_clients,
+        test_football_data_rate_limiting,
+        test_conditional_response_cache,
+        test_differential_match_sync,
+        test_team_alias_resolution,
+        test_set_based_settlement,
+        test_batched_performance_updates,
+        test_schema_migrations,
+        test_sqlite_profile_and_read_engine,
+        test_current_standings_table,
+        test_daily_cycle_recomputes_only_changed_inputs,
+        test_placed_signals_survive_recompute,
+        test_failed_compute_keeps_pending_signals,
+        test_compute_isolates_bad_match,
+        test_analyze_chunk_serializes_threads,
     ]
 
     passed = 0
@@ -0,0 +1,29 @@
+import re
+
+# Bookmaker abbreviations expanded before indexing, so "Man Utd" and
+# "Manchester United" share a key.
+_ABBREVIATIONS = {
+    "utd": "united",
+    "man": "manchester",
+    "nottm": "nottingham",
+    "wolves": "wolverhampton",
+    "spurs": "tottenham",
+}
+_FILLER = {"fc", "afc", "cf", "the"}
+
+
+def normalize_team_name(name: str) -> str:
+    # Apostrophes are dropped, not spaced, so "Nott'm" stays one word for the lookup.
+    n = name.lower().replace("&", " and ").replace("'", "").replace("\u2019", "")
+    n = re.sub(r"[^a-z0-9 ]+", " ", n)
+    words = [_ABBREVIATIONS.get(w, w) for w in n.split()]
+    return " ".join(w for w in words if w not in _FILLER)
+
+
+def name_tokens(name: str) -> frozenset:
+    return frozenset(w for w in normalize_team_name(name).split() if w != "and")
+
+
+def token_key(name: str) -> str:
+    # Order-insensitive key: "Hove Albion Brighton" == "Brighton and Hove Albion"
+    return " ".join(sorted(name_tokens(name)))